@@ -0,0 +1,42 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class CandidateJWTAuthentication(JWTAuthentication):
+
+    """
+    JWTAuthentication loading the user's candidate profile in the same
+    query, for views that need `request.user.candidate_profile`.
+
+    Users without a candidate profile still authenticate; accessing the
+    profile then raises CandidateProfile.DoesNotExist without a query.
+    """
+
+    select_related = ('candidate_profile',)
+    # Large columns no authenticated request needs
+    deferred = ('candidate_profile__resume_text', 'candidate_profile__search_vector')
+
+    def get_user(self, validated_token):
+        # JWTAuthentication.get_user, with select_related on the lookup
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = self.user_model.objects.select_related(*self.select_related).defer(*self.deferred).get(
+                **{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
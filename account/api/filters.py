@@ -0,0 +1,52 @@
+from django_filters import FilterSet, ChoiceFilter, CharFilter
+from ..models import CandidateProfile
+from job.models import Job
+from job.api.filters import MatchMode
+from job.api.recommendations import EDUCATION_LEVELS, EXPERIENCE_LEVELS
+from job.api import lookups  # registers the trigram lookups
+
+
+class CandidateFilter(FilterSet):
+
+    """
+    FilterSet for companies searching candidates, with JobFilter's
+    semantics.
+
+    The text filters (skills, location) are served by pg_trgm GIN indexes
+    and follow `match` like JobFilter's. `skills` takes comma-separated
+    terms, all of which must match. `education` and `experience` take the
+    Job choices and keep candidates at that level or above, using the
+    indexed levels read from the profile's free text.
+    """
+
+    skills = CharFilter(method='filter_skills')
+    location = CharFilter(method='filter_text')
+    education = ChoiceFilter(
+        field_name='education_level', choices=Job._meta.get_field('education').choices, method='filter_level')
+    experience = ChoiceFilter(
+        field_name='experience_level', choices=Job._meta.get_field('experience').choices, method='filter_level')
+    match = ChoiceFilter(choices=MatchMode.CHOICES, method='filter_match_mode')
+
+    class Meta:
+        model = CandidateProfile
+        fields = []
+
+    def filter_match_mode(self, queryset, name, value):
+        # Only selects how the text filters match, see filter_text()
+        return queryset
+
+    def filter_text(self, queryset, name, value):
+        if self.form.cleaned_data.get('match') == MatchMode.FUZZY:
+            lookup = 'trigram_word_similar'
+        else:
+            lookup = 'trigram_contains'
+        return queryset.filter(**{f'{name}__{lookup}': value})
+
+    def filter_skills(self, queryset, name, value):
+        for term in filter(None, (term.strip() for term in value.split(','))):
+            queryset = self.filter_text(queryset, name, term)
+        return queryset
+
+    def filter_level(self, queryset, name, value):
+        levels = EDUCATION_LEVELS if name == 'education_level' else EXPERIENCE_LEVELS
+        return queryset.filter(**{f'{name}__gte': levels[value]})
@@ -0,0 +1,162 @@
+"""
+Resume text extraction and full-text search of candidates.
+
+Uploaded resumes are turned into normalized text (account.resume_text) in
+a process pool, off the request path: a profile save whose resume differs
+from `resume_text_source` queues the profile for the background worker.
+The text is stored with a weighted `tsvector` of the profile (skills >
+name, education, experience > location > resume text), indexed with GIN.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Value, TextField
+
+from ..models import CandidateProfile
+from ..resume_text import extract_text
+from job.api.search import SEARCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Fields that feed the search vector, used to skip needless refreshes
+SEARCH_SOURCE_FIELDS = {'name', 'skills', 'education', 'experience', 'location', 'resume'}
+
+
+def candidate_search_vector(resume_text=None):
+    """
+    Expression computing the weighted search vector of a profile row.
+    Pass `resume_text` when the same UPDATE writes it, since the column
+    still holds the old text there.
+    """
+
+    text = 'resume_text' if resume_text is None else Value(resume_text, output_field=TextField())
+    return (
+        SearchVector('skills', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('name', 'education', 'experience', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='C', config=SEARCH_CONFIG)
+        + SearchVector(text, weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_candidate_search_vector(queryset):
+    return queryset.update(search_vector=candidate_search_vector())
+
+
+def store_resume_text(pk, name, text):
+    """
+    Store the extracted `text` of the resume `name`. A None text (format
+    without extractor, unreadable file) clears the previous resume's text
+    but leaves the resume pending, so a later run can extract it.
+    Skipped when the resume was replaced while it was being extracted.
+    """
+
+    return CandidateProfile.objects.filter(pk=pk, resume=name).update(
+        resume_text=text or '', resume_text_source='' if text is None else name,
+        search_vector=candidate_search_vector(text or ''),
+    )
+
+
+def resume_source(storage, name):
+    """
+    What extract_text reads `name` from in a worker process: its path for
+    local storages, its content otherwise.
+    """
+
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        try:
+            with storage.open(name, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+
+def extract_resumes(rows, pool, storage=default_storage):
+    """
+    Extract and store the resume text of `rows` ((profile pk, resume
+    name) pairs) with the worker processes of `pool`. Returns the number
+    of resumes extracted.
+    """
+
+    names = [name for _, name in rows]
+    sources = [resume_source(storage, name) for name in names]
+    texts = pool.map(extract_text, names, sources)
+    extracted = 0
+    for (pk, name), text in zip(rows, texts):
+        if store_resume_text(pk, name, text) and text is not None:
+            extracted += 1
+    return extracted
+
+
+def create_extraction_pool(workers):
+    # Workers import account.resume_text only, 'spawn' keeps them free of
+    # the parent's threads and connections
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+_pool = None
+_pending = set()
+_pending_lock = threading.Lock()
+_worker = None
+
+
+def schedule_resume_extraction(pk):
+    """
+    Extract the profile's resume text in the background once the current
+    transaction commits.
+    """
+
+    transaction.on_commit(lambda: _enqueue(pk))
+
+
+def _enqueue(pk):
+    global _worker
+    with _pending_lock:
+        _pending.add(pk)
+        if _worker is None:
+            _worker = threading.Thread(target=_extraction_worker, daemon=True)
+            _worker.start()
+
+
+def _extraction_worker():
+    global _pool, _worker
+    try:
+        while True:
+            with _pending_lock:
+                if not _pending:
+                    _worker = None
+                    return
+                pks = list(_pending)
+                _pending.clear()
+
+            rows = [
+                (pk, name) for pk, name, source in CandidateProfile.objects.filter(pk__in=pks)
+                .exclude(resume='').values_list('pk', 'resume', 'resume_text_source')
+                if name != source
+            ]
+            if not rows:
+                continue
+            try:
+                if _pool is None:
+                    _pool = create_extraction_pool(settings.RESUME_TEXT_WORKERS)
+                extract_resumes(rows, _pool)
+            except Exception:
+                # Left for the next save or extract_resume_texts. The pool
+                # may be broken (a worker process died): start a new one
+                logger.exception("Resume extraction failed for %d profile(s)", len(rows))
+                if _pool is not None:
+                    _pool.shutdown(wait=False, cancel_futures=True)
+                    _pool = None
+    finally:
+        with _pending_lock:
+            if _worker is threading.current_thread():
+                _worker = None
+        connection.close()
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 from rest_framework  import serializers
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth import authenticate
@@ -8,6 +10,7 @@ from django.contrib.auth import get_user_model
 from account.models import User
 from .utils import generate_token
 from ..models import CompanyProfile, CandidateProfile
+from utils.fast_read import Projection, to_datetime, to_date, to_file_url
 
 User = get_user_model()
 
@@ -41,6 +44,24 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
     
 
+def user_token(uuid, is_active):
+    # Same as UserRegistrationSerializer.get_token, TokenGenerator only
+    # reads these two fields of the user
+    return str(generate_token.make_token(SimpleNamespace(uuid=uuid, is_active=is_active)))
+
+
+# UserRegistrationSerializer's output for the fast read path
+USER_PROJECTION = Projection([
+    ('uuid', 'uuid'),
+    ('email', 'email'),
+    ('phone_number', 'phone_number'),
+    ('role', 'role'),
+    ('created_at', 'created_at', to_datetime),
+    ('updated_at', 'updated_at', to_datetime),
+    ('token', ('uuid', 'is_active'), user_token),
+])
+
+
 class LoginSerializer(serializers.Serializer):
 
     """
@@ -155,4 +176,45 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
         """
          
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data, **kwargs)
\ No newline at end of file
+        return super().create(validated_data, **kwargs)
+
+
+class CandidateSearchResultSerializer(serializers.ModelSerializer):
+
+    """
+    A candidate search hit for companies: the profile fields they may see,
+    the relevance and the matching excerpt of the resume.
+    """
+
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = CandidateProfile
+        fields = ('uuid', 'name', 'location', 'skills', 'experience', 'education', 'rank', 'snippet')
+
+
+# CandidateSearchResultSerializer's output for the fast read path
+CANDIDATE_SEARCH_PROJECTION = Projection([
+    ('uuid', 'uuid'),
+    ('name', 'name'),
+    ('location', 'location'),
+    ('skills', 'skills'),
+    ('experience', 'experience'),
+    ('education', 'education'),
+    ('rank', 'rank'),
+    ('snippet', 'snippet'),
+])
+
+
+# CandidateProfileSerializer's output for the fast read path
+CANDIDATE_PROFILE_PROJECTION = Projection([
+    ('name', 'name'),
+    ('birthday', 'birthday', to_date),
+    ('location', 'location'),
+    ('skills', 'skills'),
+    ('experience', 'experience'),
+    ('education', 'education'),
+    ('resume', 'resume', to_file_url),
+    ('candidate_image', 'candidate_image', to_file_url),
+])
@@ -0,0 +1,53 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from ..models import CompanyProfile, CandidateProfile
+from utils.cache_versions import bump_version
+from job.api.recommendations import candidate_education_level, candidate_experience_level
+from .resume_search import (
+    SEARCH_SOURCE_FIELDS, candidate_search_vector, schedule_resume_extraction, update_candidate_search_vector,
+)
+
+# Version counter of the public company list, see utils.conditional
+COMPANIES_VERSION = 'companies'
+
+# Free-text fields the candidate levels are read from
+LEVEL_SOURCE_FIELDS = {'education', 'experience'}
+
+
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_delete, sender=CompanyProfile)
+def bump_companies_version(sender, instance, **kwargs):
+    bump_version(COMPANIES_VERSION)
+
+
+@receiver(pre_save, sender=CandidateProfile)
+def set_candidate_levels(sender, instance, **kwargs):
+    # Indexed copies of the free-text education and experience, see CandidateFilter
+    instance.education_level = candidate_education_level(instance.education)
+    instance.experience_level = candidate_experience_level(instance.experience)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def store_candidate_levels(sender, instance, update_fields=None, **kwargs):
+    # save(update_fields=...) leaves out the levels set by set_candidate_levels
+    if update_fields is not None and LEVEL_SOURCE_FIELDS.intersection(update_fields):
+        CandidateProfile.objects.filter(pk=instance.pk).update(
+            education_level=instance.education_level, experience_level=instance.experience_level)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def refresh_candidate_search(sender, instance, update_fields=None, **kwargs):
+    # Saves that only touch non-searchable fields keep the current vector
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    profile = CandidateProfile.objects.filter(pk=instance.pk)
+    if instance.resume.name == instance.resume_text_source:
+        update_candidate_search_vector(profile)
+    elif not instance.resume:
+        profile.update(resume_text='', resume_text_source='', search_vector=candidate_search_vector(''))
+        instance.resume_text = instance.resume_text_source = ''
+    else:
+        # The resume part follows once the new resume is extracted
+        update_candidate_search_vector(profile)
+        schedule_resume_extraction(instance.pk)
@@ -11,6 +11,7 @@ urlpatterns = [
     path("candidate/create/", CandidateProfileCreateView.as_view(),  name='candidate_profile_create'),
     path("candidate/list/", CandidateProfileListView.as_view(), name='candidate_profile_update'),
     path('candidate/<uuid:uuid>/', CandidateProfileCRUDView.as_view(), name='candidate-profile-detail'),
+    path("candidates/search/", CandidateSearchView.as_view(), name='candidate_search'),
     
 
     path("company/create/", CompanyProfileCreateView.as_view(),  name='company_profile_create'),
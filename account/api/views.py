@@ -16,10 +16,23 @@ from django.shortcuts import get_object_or_404, render
 from django.contrib.auth import get_user_model
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import AllowAny
+from django.utils.decorators import method_decorator
+
+from utils.conditional import version_condition
+from utils.fast_read import FastReadMixin
+from .signals import COMPANIES_VERSION
+from django.contrib.postgres.search import SearchHeadline, SearchRank
+from django.db.models import F, Value, FloatField, TextField
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from job.api.pagination import CustomPagination
+from job.api.search import SEARCH_CONFIG, build_search_query
 
 from .serializers import *
 from ..models import *
 from .permissions import *
+from .filters import CandidateFilter
 # from backend.utils.custom_exception_handler import *
 User = get_user_model()
 
@@ -146,10 +159,12 @@ class CompanyProfilePublicListView(APIView):
     """
     API view for listing all company profiles.
     Allows all users to retrieve a list of all company profiles.
+    Conditional GETs are answered with 304 until a company profile changes.
     """
 
     permission_classes = [AllowAny]
 
+    @method_decorator(version_condition(COMPANIES_VERSION))
     def get(self, request):
         profiles = CompanyProfile.objects.all()
         serializer = PublicCompanyProfileSerializer(profiles, many=True)
@@ -281,14 +296,17 @@ Admin Dashboard Views
 # To list all the user
 
 
-class UserListView(APIView):
+class UserListView(FastReadMixin, APIView):
 
     """
     API view for listing all users.
 
     Allows admin users to retrieve a list of all registered users.
+    The list is served through the fast read path (see utils.fast_read).
     """
 
+    projection = USER_PROJECTION
+
     permission_classes = [IsAdminUser]
     authentication_classes = [JWTAuthentication]
 
@@ -296,9 +314,7 @@ class UserListView(APIView):
         # Retrieve all user objects
         users = User.objects.all().order_by('-created_at')
 
-        serializer = UserRegistrationSerializer(users, many=True)
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.fast_read_response(users, UserRegistrationSerializer, status=status.HTTP_200_OK)
 
     def delete(self, request):
         # Retrieve all user objects which is inactive
@@ -328,21 +344,68 @@ class UserDetailView(APIView):
 # To list all the candidate user
 
 
-class CandidateProfileListView(APIView):
+class CandidateProfileListView(FastReadMixin, APIView):
 
     """
     API view for listing all candidate profiles.
 
     Allows admin users to retrieve a list of all candidate profiles.
+    The list is served through the fast read path (see utils.fast_read).
     """
 
+    projection = CANDIDATE_PROFILE_PROJECTION
+
     permission_classes = [IsAdminUser]
     authentication_classes = [JWTAuthentication]
 
     def get(self, request):
-        profiles = CandidateProfile.objects.all()
-        serializer = CandidateProfileSerializer(profiles, many=True)
-        return Response(serializer.data)
+        profiles = CandidateProfile.objects.defer('resume_text', 'search_vector')
+        return self.fast_read_response(profiles, CandidateProfileSerializer)
+
+
+class CandidateSearchView(FastReadMixin, generics.ListAPIView):
+
+    """
+    API view for companies searching candidates: GET with optional
+    ?q=<terms> matched against the profile and resume text, and the
+    CandidateFilter filters (skills, location, education, experience,
+    match), paginated.
+
+    With `q` the best matches come first, otherwise candidates are listed
+    in a stable order. Every filter is served by an index, the resume
+    excerpt is only computed for the rows of the page, and only the fields
+    a company may see are read, so a page costs two queries (count and
+    rows) through the fast read path (see utils.fast_read).
+    """
+
+    serializer_class = CandidateSearchResultSerializer
+    projection = CANDIDATE_SEARCH_PROJECTION
+    pagination_class = CustomPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = CandidateFilter
+    permission_classes = [IsAuthenticated, IsCompanyUser]
+    authentication_classes = [JWTAuthentication]
+
+    def get_queryset(self):
+        candidates = CandidateProfile.objects.only('uuid', 'name', 'location', 'skills', 'experience', 'education')
+        terms = self.request.query_params.get('q')
+        if terms is None:
+            return candidates.annotate(
+                rank=Value(None, output_field=FloatField()),
+                snippet=Value(None, output_field=TextField()),
+            ).order_by('uuid')
+
+        query = build_search_query([terms])
+        if query is None:
+            raise ValidationError({"q": ["Give at least one search term."]})
+        return (
+            candidates.filter(search_vector=query)
+            .annotate(
+                rank=SearchRank(F('search_vector'), query),
+                snippet=SearchHeadline('resume_text', query, config=SEARCH_CONFIG, max_words=30, min_words=10),
+            )
+            .order_by('-rank', 'uuid')
+        )
 
 
 # To list all the  company user
@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from account.models import CandidateProfile
+from account.api.resume_search import create_extraction_pool, extract_resumes, update_candidate_search_vector
+
+class Command(BaseCommand):
+    help = ('Extracts the text of the resumes not extracted yet, in parallel worker processes, '
+            'and fills in missing candidate search vectors. Interrupted runs pick up where they stopped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.RESUME_TEXT_WORKERS,
+                            help='Worker processes extracting text.')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Resumes extracted and stored per batch.')
+        parser.add_argument('--all', action='store_true',
+                            help='Extract every resume again, e.g. after an extractor change.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            CandidateProfile.objects.exclude(resume_text_source='').update(resume_text_source='')
+
+        # Progress is the resume_text_source column itself: every batch is
+        # committed, so a new run only sees what is left
+        pending = CandidateProfile.objects.exclude(resume='').exclude(resume_text_source=F('resume')).order_by('pk')
+        total = pending.count()
+        started = time.monotonic()
+        extracted, last_pk = 0, None
+        with create_extraction_pool(options['workers']) as pool:
+            while True:
+                batch = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+                rows = list(batch.values_list('pk', 'resume')[:options['batch_size']])
+                if not rows:
+                    break
+                extracted += extract_resumes(rows, pool)
+                last_pk = rows[-1][0]
+                self.stdout.write(f"{extracted}/{total} resume(s) extracted ({time.monotonic() - started:.1f}s)")
+
+        # Profiles without a resume, or saved before search existed
+        vectors = 0
+        missing = CandidateProfile.objects.filter(search_vector__isnull=True).order_by('pk')
+        while True:
+            pks = list(missing.values_list('pk', flat=True)[:1000])
+            if not pks:
+                break
+            vectors += update_candidate_search_vector(CandidateProfile.objects.filter(pk__in=pks))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Extracted {extracted} resume(s) and indexed {vectors} more profile(s) "
+            f"in {time.monotonic() - started:.2f}s."))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0006_alter_candidateprofile_candidate_image_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['company_name'], name='company_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='resume_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='resume_text_source',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='candidate_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:37
+
+import re
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# Frozen copies of job.api.recommendations' candidate_education_level()
+# and candidate_experience_level(), so later changes to those helpers
+# cannot change what this migration does
+
+TOKEN_RE = re.compile(r'\w+')
+
+DOTTED_DEGREE_RE = re.compile(r'\b([mb])\.\s?([ae])\b', re.IGNORECASE)
+
+YEARS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)')
+
+# Levels of the Job Education choices: Higher Secondary, Bachelors, Master, Phd
+EDUCATION_KEYWORDS = (
+    (3, ('phd', 'doctorate', 'doctor')),
+    (2, ('master', 'masters', 'mtech', 'msc', 'mca', 'mba', 'm.e', 'm.a')),
+    (1, ('bachelor', 'bachelors', 'btech', 'bsc', 'bca', 'b.e', 'b.a', 'degree')),
+    (0, ('higher', 'secondary', '12th', 'plus', 'hsc')),
+)
+
+# Level of the Job Experience choice '3 Years above'
+MAX_EXPERIENCE_LEVEL = 3
+
+BATCH_SIZE = 2000
+
+
+def education_level(text):
+    text = text or ''
+    tokens = set(TOKEN_RE.findall(text.replace('.', '').lower()))
+    tokens.update(f'{degree}.{field}'.lower() for degree, field in DOTTED_DEGREE_RE.findall(text))
+    for level, keywords in EDUCATION_KEYWORDS:
+        if tokens.intersection(keywords):
+            return level
+    return None
+
+
+def experience_level(text):
+    text = (text or '').lower()
+    if 'fresher' in text:
+        return 0
+    match = YEARS_RE.search(text)
+    if not match:
+        return None
+    return min(int(float(match.group(1))), MAX_EXPERIENCE_LEVEL)
+
+
+def set_levels(apps, schema_editor):
+    CandidateProfile = apps.get_model('account', 'CandidateProfile')
+    profiles = CandidateProfile.objects.only('education', 'experience').order_by('pk')
+    last_pk = None
+    while True:
+        batch = list((profiles if last_pk is None else profiles.filter(pk__gt=last_pk))[:BATCH_SIZE])
+        if not batch:
+            break
+        for profile in batch:
+            profile.education_level = education_level(profile.education)
+            profile.experience_level = experience_level(profile.experience)
+        CandidateProfile.objects.bulk_update(batch, ['education_level', 'experience_level'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0008_candidateprofile_resume_text_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='education_level',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='experience_level',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(set_levels, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['skills'], name='candidate_skills_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='candidate_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['education_level'], name='candidate_education_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['experience_level'], name='candidate_experience_level_idx'),
+        ),
+    ]
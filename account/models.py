@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from .manager import UserManager
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
 from django.contrib.auth.hashers import make_password
@@ -78,6 +80,9 @@ class CompanyProfile(models.Model):
         verbose_name = 'company_profile'
         verbose_name_plural = 'company_profiles'
         db_table = 'company_profile'
+        indexes = [
+            GinIndex(fields=['company_name'], name='company_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         return self.company_name
@@ -86,6 +91,14 @@ class CompanyProfile(models.Model):
     def id(self):
         return self.uuid
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Name as stored, so saves can tell renames (which change every job's
+        # search document) from other profile edits
+        instance._loaded_company_name = instance.__dict__.get('company_name')
+        return instance
+
 
 class CandidateProfile(models.Model):
 
@@ -112,11 +125,28 @@ class CandidateProfile(models.Model):
         upload_to='resumes/', blank=True)
     candidate_image = models.ImageField(
         upload_to='candidate_images/', blank=True, null=True)
+    # Normalized text of the resume and the resume name it was extracted
+    # from, maintained by account.api.resume_search
+    resume_text = models.TextField(blank=True, default='', editable=False)
+    resume_text_source = models.CharField(max_length=255, blank=True, default='', editable=False)
+    # Weighted full-text document of the profile and resume text
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Job Education / Experience levels read from the free-text fields,
+    # for the indexed filters of the candidate search
+    education_level = models.PositiveSmallIntegerField(null=True, editable=False)
+    experience_level = models.PositiveSmallIntegerField(null=True, editable=False)
 
     class Meta:
         verbose_name = 'candidate_profile'
         verbose_name_plural = 'candidate_profiles'
         db_table = 'candidate_profile'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='candidate_search_vector_idx'),
+            GinIndex(fields=['skills'], name='candidate_skills_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='candidate_location_trgm_idx', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['education_level'], name='candidate_education_level_idx'),
+            models.Index(fields=['experience_level'], name='candidate_experience_level_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name}'s Profile"
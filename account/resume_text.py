@@ -0,0 +1,87 @@
+"""
+Plain-text extraction from resume files.
+
+Pure functions without Django imports, so they can run in the worker
+processes of a ProcessPoolExecutor started with the 'spawn' method.
+DOCX files are read with zipfile and ElementTree, PDF files with pypdf.
+"""
+
+import io
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+from pypdf import PdfReader
+
+
+# Longer texts are cut, tsvectors are limited to 1 MB
+MAX_TEXT_LENGTH = 100_000
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+_SPACE_RE = re.compile(r'[ \t\f\v]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+def normalize_text(text):
+    """
+    NFKC-normalized text with control characters dropped and runs of
+    whitespace and blank lines collapsed.
+    """
+
+    text = unicodedata.normalize('NFKC', text)
+    text = ''.join(char for char in text if char in '\n\t' or unicodedata.category(char)[0] != 'C')
+    text = _SPACE_RE.sub(' ', text)
+    text = _BLANK_LINES_RE.sub('\n', text)
+    return '\n'.join(line.strip() for line in text.split('\n')).strip()[:MAX_TEXT_LENGTH]
+
+
+def docx_text(data):
+    paragraphs, parts = [], []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive, archive.open('word/document.xml') as document:
+        for event, element in ElementTree.iterparse(document, events=('end',)):
+            if element.tag == WORD_NAMESPACE + 't':
+                parts.append(element.text or '')
+            elif element.tag == WORD_NAMESPACE + 'tab':
+                parts.append('\t')
+            elif element.tag in (WORD_NAMESPACE + 'br', WORD_NAMESPACE + 'cr'):
+                parts.append('\n')
+            elif element.tag == WORD_NAMESPACE + 'p':
+                paragraphs.append(''.join(parts))
+                parts = []
+                # Paragraphs are done with, keep memory flat on long documents
+                element.clear()
+    return '\n'.join(paragraphs)
+
+
+def pdf_text(data):
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+EXTRACTORS = {
+    '.docx': docx_text,
+    '.pdf': pdf_text,
+}
+
+
+def extract_text(name, source):
+    """
+    Normalized text of the resume `name`, read from `source` (a file
+    path, or the file's content as bytes). Returns None for unsupported
+    formats and unreadable files.
+    """
+
+    extractor = EXTRACTORS.get(name[name.rfind('.'):].lower() if '.' in name else '')
+    if extractor is None:
+        return None
+    try:
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                source = file.read()
+        text = extractor(source)
+    except Exception:
+        # Corrupt or encrypted files, missing parts, ...
+        return None
+    return None if text is None else normalize_text(text)
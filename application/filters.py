@@ -0,0 +1,26 @@
+from django_filters import FilterSet, BooleanFilter, ChoiceFilter, DateTimeFilter, UUIDFilter
+from .models import Application
+
+
+class ApplicationFilter(FilterSet):
+
+    """
+    FilterSet for filtering job applications by job, status and
+    application date range. Archived applications (to expired jobs) are
+    left out unless `archived` is given.
+    """
+
+    job = UUIDFilter(field_name='job_id')
+    status = ChoiceFilter(choices=Application._meta.get_field('status').choices)
+    applied_after = DateTimeFilter(field_name='application_date', lookup_expr='gte')
+    applied_before = DateTimeFilter(field_name='application_date', lookup_expr='lt')
+    archived = BooleanFilter(field_name='is_archived')
+
+    class Meta:
+        model = Application
+        fields = ['job', 'status']
+
+    def filter_queryset(self, queryset):
+        if self.form.cleaned_data.get('archived') is None:
+            queryset = queryset.filter(is_archived=False)
+        return super().filter_queryset(queryset)
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from application.models import Application
+from application.ranking import score_applications
+from job.models import Job
+
+class Command(BaseCommand):
+    help = 'Scores every application (or those of the given jobs) against its job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('jobs', nargs='*',
+                            help='UUIDs of the jobs whose applicants are scored; all jobs by default.')
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Jobs scored per batch.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        jobs = Job.objects.filter(applications__isnull=False).distinct().order_by('pk')
+        if options['jobs']:
+            jobs = jobs.filter(pk__in=options['jobs'])
+        job_ids = list(jobs.values_list('pk', flat=True))
+
+        scored = 0
+        for start in range(0, len(job_ids), options['batch_size']):
+            batch = job_ids[start:start + options['batch_size']]
+            scored += score_applications(Application.objects.filter(job_id__in=batch))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {scored} application(s) of {len(job_ids)} job(s) in {elapsed:.2f}s."))
@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+
+from application.models import Application
+from application.rollups import rebuild_rollups, rollup_day
+
+class Command(BaseCommand):
+    help = 'Recomputes the daily application rollups of a range of days, in parallel chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat,
+                            help='First day to rebuild (YYYY-MM-DD); the first application by default.')
+        parser.add_argument('--until', type=date.fromisoformat,
+                            help='Last day to rebuild (YYYY-MM-DD); the last application by default.')
+        parser.add_argument('--chunk-days', type=int, default=31,
+                            help='Days rebuilt per transaction.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Chunks rebuilt concurrently, each on its own connection.')
+
+    def handle(self, *args, **options):
+        bounds = Application.objects.aggregate(first=Min('application_date'), last=Max('application_date'))
+        if bounds['first'] is None and not (options['since'] and options['until']):
+            self.stdout.write("No applications, nothing to rebuild.")
+            return
+        since = options['since'] or rollup_day(bounds['first'])
+        until = options['until'] or rollup_day(bounds['last'])
+        if since > until:
+            raise CommandError("--since must not be after --until.")
+
+        chunks = []
+        first_day = since
+        while first_day <= until:
+            last_day = min(first_day + timedelta(days=options['chunk_days'] - 1), until)
+            chunks.append((first_day, last_day))
+            first_day = last_day + timedelta(days=1)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            rows = sum(pool.map(lambda chunk: self.rebuild_chunk(*chunk), chunks))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {since} to {until} ({len(chunks)} chunk(s), {rows} rollup row(s)) in {elapsed:.2f}s."))
+
+    def rebuild_chunk(self, first_day, last_day):
+        try:
+            return rebuild_rollups(first_day, last_day)
+        finally:
+            # Each worker thread has its own connection
+            connection.close()
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application', '0003_alter_application_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='is_archived',
+            field=models.BooleanField(default=False),
+        ),
+    ]
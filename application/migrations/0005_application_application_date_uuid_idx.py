@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('application', '0004_application_is_archived'),
+        ('job', '0011_job_views'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-application_date', '-uuid'], name='application_date_uuid_idx'),
+        ),
+    ]
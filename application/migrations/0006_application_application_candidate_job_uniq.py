@@ -0,0 +1,32 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:27
+
+from django.db import migrations, models
+
+
+def delete_duplicate_applications(apps, schema_editor):
+    # Keep the earliest application of each (candidate, job) pair
+    Application = apps.get_model('application', 'Application')
+    duplicates = (
+        Application.objects.values('candidate', 'job')
+        .annotate(count=models.Count('uuid')).filter(count__gt=1)
+    )
+    for pair in duplicates:
+        applications = Application.objects.filter(candidate=pair['candidate'], job=pair['job'])
+        keep = applications.order_by('application_date', 'uuid').values_list('uuid', flat=True)[0]
+        applications.exclude(uuid=keep).delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('application', '0005_application_application_date_uuid_idx'),
+        ('job', '0011_job_views'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('candidate', 'job'), name='application_candidate_job_uniq'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('application', '0006_application_application_candidate_job_uniq'),
+        ('job', '0011_job_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-score', '-uuid'], name='application_job_score_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    # Rollups of the applications received before the table existed
+    Application = apps.get_model('application', 'Application')
+    ApplicationDailyRollup = apps.get_model('application', 'ApplicationDailyRollup')
+    rows = (
+        Application.objects.annotate(day=TruncDate('application_date'))
+        .values('job_id', 'job__company_id', 'day', 'status')
+        .annotate(count=models.Count('uuid')).order_by()
+    )
+    ApplicationDailyRollup.objects.bulk_create((
+        ApplicationDailyRollup(
+            company_id=row['job__company_id'], job_id=row['job_id'],
+            day=row['day'], status=row['status'], count=row['count'],
+        )
+        for row in rows.iterator()
+    ), batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('application', '0007_application_score_and_more'),
+        ('job', '0011_job_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('Declined', 'Declined'), ('Pending', 'Pending'), ('Accepted', 'Accepted')], max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_rollups', to='account.companyprofile')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_rollups', to='job.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'day'], name='rollup_company_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailyrollup',
+            constraint=models.UniqueConstraint(fields=('job', 'day', 'status'), name='rollup_job_day_status_uniq'),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
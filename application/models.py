@@ -3,21 +3,73 @@ from django.conf import settings
 import uuid
 
 from job.models import Job
-from account.models import CandidateProfile
+from account.models import CandidateProfile, CompanyProfile
 
 
 # Create your models here.
 
+STATUS_CHOICES = [
+    ('Declined', 'Declined'),
+    ('Pending', 'Pending'),
+    ('Accepted', 'Accepted'),
+]
+
+
 class Application(models.Model):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='applications')
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     application_date = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=50, choices=[
-        ('Declined', 'Declined'),
-        ('Pending', 'Pending'),
-        ('Accepted', 'Accepted'),
-    ], default='Pending')
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='Pending')
+    # Set when the job expires, instead of deleting the application
+    is_archived = models.BooleanField(default=False)
+    # Candidate-to-job match from 0 to 100, maintained by application.ranking
+    score = models.FloatField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs the (application_date, uuid) keyset pagination of the lists
+            models.Index(fields=['-application_date', '-uuid'], name='application_date_uuid_idx'),
+            # Backs the per-job lists ranked by score
+            models.Index(fields=['job', '-score', '-uuid'], name='application_job_score_idx'),
+        ]
+        constraints = [
+            # One application per candidate and job, also under concurrent submissions
+            models.UniqueConstraint(fields=['candidate', 'job'], name='application_candidate_job_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.candidate} applied for {self.job}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, so saves can move the rollup count it was in
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+
+class ApplicationDailyRollup(models.Model):
+
+    """
+    Number of applications of one job received on one day that are
+    currently in one status, maintained by application.rollups.
+    """
+
+    company = models.ForeignKey(CompanyProfile, on_delete=models.CASCADE, related_name='application_rollups')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_rollups')
+    day = models.DateField()
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day', 'status'], name='rollup_job_day_status_uniq'),
+        ]
+        indexes = [
+            # Backs the company-wide funnel; per-job series use the unique index
+            models.Index(fields=['company', 'day'], name='rollup_company_day_idx'),
+        ]
 
     def __str__(self) -> str:
-        return f"{self.candidate} applied for {self.job}"
\ No newline at end of file
+        return f"{self.job} {self.day} {self.status}: {self.count}"
@@ -0,0 +1,251 @@
+"""
+Applicant ranking.
+
+Every application gets a 0-100 score of the candidate against the job,
+stored on the row so the lists can sort by it with an index. The score is
+a weighted sum of:
+
+    keywords    share of the job's title/description terms found in the
+                candidate's skills, education, experience and past positions
+    industry    share of the job's it_industry terms found in the same text
+    education   1 when the candidate meets the required level, less per
+                missing level
+    experience  years of experience (history, or the free-text field)
+                over the years required, capped at 1
+
+The applicants of a job are scored together: their terms form a sparse
+presence matrix over the job's vocabulary, and each component is one
+matrix-vector product or array expression over all of them.
+
+Writes schedule a rescore of what they affect only: the application on
+submission, a job's applicants when its scored fields change, a
+candidate's applications when their profile or experience changes.
+"""
+
+import logging
+import threading
+from datetime import date
+
+import numpy as np
+from django.db import connection, transaction
+from scipy import sparse
+
+from .models import Application
+from account.models import CandidateProfile
+from experience.models import Experience
+from job.models import Job
+from job.api.search_index import tokenize
+from job.api.recommendations import (
+    STOP_WORDS, EDUCATION_LEVELS, EXPERIENCE_LEVELS, candidate_education_level, candidate_experience_level,
+)
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = {'keywords': 0.4, 'industry': 0.2, 'education': 0.2, 'experience': 0.2}
+
+# Job fields the score depends on
+JOB_SCORE_FIELDS = frozenset(['title', 'description', 'it_industry', 'education', 'experience'])
+
+# Candidate profile fields the score depends on
+CANDIDATE_SCORE_FIELDS = frozenset(['skills', 'education', 'experience'])
+
+# (uuid, score) pairs per UPDATE statement
+WRITE_BATCH_SIZE = 1000
+
+
+def _terms(*texts):
+    return {token for text in texts for token in tokenize(text) if token not in STOP_WORDS}
+
+
+def experience_years(periods, today=None):
+    """
+    Years covered by the (start_date, end_date) `periods`, overlapping
+    periods counted once. An open period runs until today.
+    """
+
+    today = today or date.today()
+    years, current_start, current_end = 0.0, None, None
+    for start, end in sorted((start, end or today) for start, end in periods):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                years += (current_end - current_start).days / 365.25
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        years += (current_end - current_start).days / 365.25
+    return years
+
+
+class CandidateFeatures:
+
+    """
+    What the score needs to know about one candidate.
+    """
+
+    __slots__ = ('terms', 'education', 'years')
+
+    def __init__(self, candidate, periods, positions):
+        self.terms = _terms(candidate.skills, candidate.education, candidate.experience, *positions)
+        self.education = candidate_education_level(candidate.education)
+        level = candidate_experience_level(candidate.experience)
+        # Experience levels are year counts ('2 Years' is level 2)
+        self.years = max(experience_years(periods), level or 0)
+
+
+def load_candidate_features(candidate_ids):
+    candidates = CandidateProfile.objects.filter(pk__in=candidate_ids).only(*CANDIDATE_SCORE_FIELDS)
+    history = {}
+    rows = Experience.objects.filter(candidate_id__in=candidate_ids).values_list(
+        'candidate_id', 'position', 'start_date', 'end_date')
+    for candidate_id, position, start_date, end_date in rows:
+        periods, positions = history.setdefault(candidate_id, ([], []))
+        periods.append((start_date, end_date))
+        positions.append(position)
+    return {
+        candidate.pk: CandidateFeatures(candidate, *history.get(candidate.pk, ([], [])))
+        for candidate in candidates
+    }
+
+
+def score_job_applicants(job, features):
+    """
+    Scores of the candidates `features` (a list of CandidateFeatures) for
+    `job`, as a float array.
+    """
+
+    count = len(features)
+    keyword_terms = sorted(_terms(job.title, job.description))
+    industry_terms = sorted(_terms(job.it_industry))
+    vocabulary = {term: column for column, term in enumerate(dict.fromkeys(keyword_terms + industry_terms))}
+
+    # Candidate x job term presence
+    indptr, indices = [0], []
+    for candidate in features:
+        indices.extend(vocabulary[term] for term in candidate.terms if term in vocabulary)
+        indptr.append(len(indices))
+    presence = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(count, len(vocabulary)))
+
+    def coverage(terms):
+        if not terms:
+            return np.ones(count)
+        weights = np.zeros(len(vocabulary))
+        weights[[vocabulary[term] for term in terms]] = 1
+        return presence @ weights / len(terms)
+
+    required_education = EDUCATION_LEVELS.get(job.education, 0)
+    education = np.array([np.nan if c.education is None else c.education for c in features], dtype=float)
+    # Unknown education scores 0; each missing level costs a third
+    education_score = np.where(
+        np.isnan(education), 0, np.clip(1 - (required_education - education) / 3, 0, 1))
+
+    required_years = EXPERIENCE_LEVELS.get(job.experience, 0)
+    years = np.array([c.years for c in features], dtype=float)
+    experience_score = np.minimum(years / required_years, 1) if required_years else np.ones(count)
+
+    score = (
+        WEIGHTS['keywords'] * coverage(keyword_terms)
+        + WEIGHTS['industry'] * coverage(industry_terms)
+        + WEIGHTS['education'] * education_score
+        + WEIGHTS['experience'] * experience_score
+    )
+    return np.round(score * 100, 2)
+
+
+def write_scores(scores):
+    """
+    Store `scores` ({application uuid: score}), WRITE_BATCH_SIZE
+    applications per UPDATE statement.
+    """
+
+    table = connection.ops.quote_name(Application._meta.db_table)
+    items = list(scores.items())
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), WRITE_BATCH_SIZE):
+                batch = items[start:start + WRITE_BATCH_SIZE]
+                values = ', '.join(['(%s::uuid, %s::double precision)'] * len(batch))
+                params = [value for item in batch for value in item]
+                cursor.execute(
+                    f"UPDATE {table} AS application SET score = new.score "
+                    f"FROM (VALUES {values}) AS new (uuid, score) "
+                    f"WHERE application.uuid = new.uuid AND application.score IS DISTINCT FROM new.score",
+                    params,
+                )
+    return len(items)
+
+
+def score_applications(applications):
+    """
+    Score and store the `applications` queryset, job by job. Returns the
+    number of applications scored.
+    """
+
+    by_job = {}
+    for application_uuid, job_id, candidate_id in applications.order_by().values_list('uuid', 'job_id', 'candidate_id'):
+        by_job.setdefault(job_id, []).append((application_uuid, candidate_id))
+    if not by_job:
+        return 0
+
+    jobs = Job.objects.filter(pk__in=list(by_job)).only(*JOB_SCORE_FIELDS)
+    features = load_candidate_features({candidate_id for rows in by_job.values() for _, candidate_id in rows})
+
+    scores = {}
+    for job in jobs:
+        rows = [(application_uuid, features[candidate_id]) for application_uuid, candidate_id in by_job[job.pk]]
+        job_scores = score_job_applicants(job, [candidate for _, candidate in rows])
+        scores.update(zip([application_uuid for application_uuid, _ in rows], job_scores.tolist()))
+    return write_scores(scores)
+
+
+_pending = {'application': set(), 'job': set(), 'candidate': set()}
+_pending_lock = threading.Lock()
+_worker = None
+
+
+def schedule_rescore(kind, pks):
+    """
+    Rescore the applications of the given applications, jobs or
+    candidates (`kind`) in a background thread once the current
+    transaction commits.
+    """
+
+    pks = set(pks)
+    if pks:
+        transaction.on_commit(lambda: _enqueue(kind, pks))
+
+
+def _enqueue(kind, pks):
+    global _worker
+    with _pending_lock:
+        _pending[kind].update(pks)
+        if _worker is None:
+            _worker = threading.Thread(target=_rescore_worker, daemon=True)
+            _worker.start()
+
+
+def _rescore_worker():
+    global _worker
+    try:
+        while True:
+            with _pending_lock:
+                pending = {kind: pks for kind, pks in _pending.items() if pks}
+                if not pending:
+                    _worker = None
+                    return
+                for kind in pending:
+                    _pending[kind] = set()
+
+            lookups = {'application': 'pk__in', 'job': 'job_id__in', 'candidate': 'candidate_id__in'}
+            for kind, pks in pending.items():
+                try:
+                    score_applications(Application.objects.filter(**{lookups[kind]: list(pks)}))
+                except Exception:
+                    # Stale scores are refreshed by the next change or rank_applications
+                    logger.exception("Rescoring the applications of %d %s(s) failed", len(pks), kind)
+    finally:
+        with _pending_lock:
+            if _worker is threading.current_thread():
+                _worker = None
+        connection.close()
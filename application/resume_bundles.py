@@ -0,0 +1,303 @@
+"""
+Prebuilt resume bundles.
+
+The resumes of a company's applicants (or of one job's applicants) are
+kept as a zip file under RESUME_BUNDLE_ROOT, next to a JSON manifest
+listing, per resume, its SHA-256, its name in the archive and the
+applications it belongs to:
+
+    company-<uuid>.zip / company-<uuid>.json
+    job-<uuid>.zip / job-<uuid>.json
+
+A bundle is fresh when the manifest matches the applications in the
+database. New resumes are appended to a copy of the current archive, so
+only their files are read; a bundle is rebuilt from scratch only when one
+of its resumes is gone or changed. Files are read from storage by a thread
+pool, and the archive and manifest are swapped in with renames so the
+front proxy (X-Accel-Redirect / X-Sendfile) never serves a partial file.
+
+Updates run in a background thread after the transaction commits, and
+only for bundles that were downloaded at least once.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+from .models import Application
+from job.models import Job
+from .resumes import unique_arcname
+
+logger = logging.getLogger(__name__)
+
+# Reads queued ahead of the writer, per read worker
+READ_AHEAD = 2
+
+
+def _read_resume(storage, name):
+    try:
+        with storage.open(name, 'rb') as source:
+            data = source.read()
+    except OSError:
+        return None, None
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def read_resumes(names, storage=default_storage):
+    """
+    Yield (name, content, sha256) for `names` in order, reading ahead in a
+    thread pool. Missing files yield None content and hash.
+    """
+
+    workers = settings.RESUME_BUNDLE_READ_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for name in names:
+            window.append((name, pool.submit(_read_resume, storage, name)))
+            # Bounded, so memory stays flat however many resumes there are
+            if len(window) >= workers * READ_AHEAD:
+                name, future = window.popleft()
+                yield (name, *future.result())
+        while window:
+            name, future = window.popleft()
+            yield (name, *future.result())
+
+
+class ResumeBundle:
+
+    """
+    The on-disk bundle of one company ('company') or one job ('job').
+    """
+
+    def __init__(self, kind, pk, root=None):
+        self.kind = kind
+        self.pk = pk
+        self.root = Path(root or settings.RESUME_BUNDLE_ROOT)
+        self.zip_path = self.root / f'{kind}-{pk}.zip'
+        self.manifest_path = self.root / f'{kind}-{pk}.json'
+
+    @property
+    def lock_key(self):
+        return f'resume_bundle:{self.kind}:{self.pk}'
+
+    def applications(self):
+        if self.kind == 'job':
+            return Application.objects.filter(job_id=self.pk)
+        return Application.objects.filter(job__company_id=self.pk)
+
+    def current_state(self):
+        """
+        {resume name: set of application uuids} from the database, in one
+        query.
+        """
+
+        state = {}
+        rows = (
+            self.applications().exclude(candidate__resume='')
+            .values_list('candidate__resume', 'uuid')
+            .iterator(chunk_size=2000)
+        )
+        for name, application_uuid in rows:
+            state.setdefault(name, set()).add(str(application_uuid))
+        return state
+
+    def load_manifest(self):
+        try:
+            return orjson.loads(self.manifest_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def is_fresh(self, state, manifest=None):
+        manifest = manifest or self.load_manifest()
+        if manifest is None or not self.zip_path.exists():
+            return False
+        resumes = manifest['resumes']
+        return resumes.keys() == state.keys() and all(
+            set(resumes[name]['applications']) == applications for name, applications in state.items())
+
+    def update(self, recheck=(), storage=default_storage):
+        """
+        Bring the bundle up to date with the database. Resumes in `recheck`
+        are hashed again and force a rebuild when their content changed.
+        Returns 'fresh', 'manifest', 'appended' or 'rebuilt'.
+        """
+
+        state = self.current_state()
+        manifest = self.load_manifest()
+        if not self.zip_path.exists():
+            manifest = None
+
+        if manifest is not None:
+            resumes = manifest['resumes']
+            rebuild = any(name not in state for name in resumes)
+            rechecked = [name for name in recheck if name in resumes]
+            if not rebuild and rechecked:
+                rebuild = any(sha256 != resumes[name]['sha256']
+                              for name, _, sha256 in read_resumes(rechecked, storage))
+            if not rebuild and self.is_fresh(state, manifest):
+                return 'fresh'
+            if rebuild:
+                manifest = None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        if manifest is None:
+            resumes, new_names, mode, outcome = {}, sorted(state), 'w', 'rebuilt'
+        else:
+            new_names = sorted(name for name in state if name not in resumes)
+            mode, outcome = 'a', 'appended' if new_names else 'manifest'
+
+        # A rebuild writes an archive even when there is nothing to put in it
+        if new_names or mode == 'w':
+            fd, tmp_zip = tempfile.mkstemp(prefix=f'.{self.zip_path.name}.', dir=self.root)
+            os.close(fd)
+            try:
+                if mode == 'a':
+                    # The archive being served is never written in place
+                    shutil.copyfile(self.zip_path, tmp_zip)
+                self._write_entries(tmp_zip, mode, new_names, resumes, storage)
+                os.chmod(tmp_zip, 0o644)
+                os.replace(tmp_zip, self.zip_path)
+            except BaseException:
+                os.unlink(tmp_zip)
+                raise
+
+        for name, applications in state.items():
+            resumes[name]['applications'] = sorted(applications)
+        self._write_manifest({'resumes': resumes, 'updated_at': timezone.now()})
+        return outcome
+
+    def _write_entries(self, path, mode, names, resumes, storage):
+        used = {entry['arcname'] for entry in resumes.values() if entry['arcname']}
+        date_time = timezone.localtime().timetuple()[:6]
+        # Resumes (PDF, DOCX) are compressed already, storing them is cheaper
+        with zipfile.ZipFile(path, mode, compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, content, sha256 in read_resumes(names, storage):
+                arcname = None
+                if content is not None:
+                    arcname = unique_arcname(name, used)
+                    info = zipfile.ZipInfo(arcname, date_time=date_time)
+                    info.external_attr = 0o644 << 16
+                    archive.writestr(info, content)
+                # Missing files are recorded too, so they are not read again
+                resumes[name] = {'arcname': arcname, 'sha256': sha256, 'applications': []}
+
+    def _write_manifest(self, manifest):
+        fd, tmp_manifest = tempfile.mkstemp(prefix=f'.{self.manifest_path.name}.', dir=self.root)
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(orjson.dumps(manifest, option=orjson.OPT_UTC_Z))
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def delete(self):
+        for path in (self.zip_path, self.manifest_path):
+            path.unlink(missing_ok=True)
+
+    def response(self, filename):
+        """
+        Download response for the archive, handed to the front proxy when
+        RESUME_BUNDLE_SENDFILE is set.
+        """
+
+        sendfile = settings.RESUME_BUNDLE_SENDFILE
+        if sendfile == 'x-accel-redirect':
+            response = HttpResponse(content_type='application/zip')
+            response['X-Accel-Redirect'] = settings.RESUME_BUNDLE_ACCEL_PREFIX + self.zip_path.name
+        elif sendfile == 'x-sendfile':
+            response = HttpResponse(content_type='application/zip')
+            response['X-Sendfile'] = str(self.zip_path)
+        else:
+            response = FileResponse(open(self.zip_path, 'rb'), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+_pending = {}
+_pending_lock = threading.Lock()
+_worker = None
+
+
+def schedule_bundle_update(kind, pk, recheck=(), create=False):
+    """
+    Update the bundle(s) after the current transaction commits. `kind` is
+    'company', 'job' or 'candidate' (the bundles of every job the
+    candidate applied to); a job's update also covers its company's
+    bundle. Bundles that do not exist yet are only built
+    when `create` is set.
+    """
+
+    transaction.on_commit(lambda: _enqueue((kind, pk), set(recheck), create))
+
+
+def _enqueue(task, recheck, create):
+    global _worker
+    with _pending_lock:
+        pending_recheck, pending_create = _pending.get(task, (set(), False))
+        _pending[task] = (pending_recheck | recheck, pending_create or create)
+        if _worker is None:
+            _worker = threading.Thread(target=_update_worker, daemon=True)
+            _worker.start()
+
+
+def _expand(task, recheck, create):
+    kind, pk = task
+    if kind == 'candidate':
+        rows = Application.objects.filter(candidate_id=pk).values_list('job_id', 'job__company_id').distinct()
+        for job_id, company_id in rows:
+            yield ResumeBundle('job', job_id), recheck, create
+            yield ResumeBundle('company', company_id), recheck, create
+    elif kind == 'job':
+        company_id = Job.objects.filter(pk=pk).values_list('company_id', flat=True).first()
+        if company_id is None:
+            # The job is gone, and so are its applications
+            ResumeBundle('job', pk).delete()
+            return
+        yield ResumeBundle('job', pk), recheck, create
+        # A job download does not create the whole company's bundle
+        yield ResumeBundle('company', company_id), recheck, False
+    else:
+        yield ResumeBundle(kind, pk), recheck, create
+
+
+def _update_worker():
+    global _worker
+    try:
+        while True:
+            with _pending_lock:
+                if not _pending:
+                    _worker = None
+                    return
+                task, (task_recheck, task_create) = _pending.popitem()
+
+            for bundle, recheck, create in _expand(task, task_recheck, task_create):
+                if not create and not bundle.manifest_path.exists():
+                    continue
+                # One builder per bundle across processes. A skipped update
+                # is caught by the freshness check of the next download
+                if not cache.add(bundle.lock_key, 1, timeout=600):
+                    continue
+                try:
+                    bundle.update(recheck)
+                except Exception:
+                    # Downloads fall back to streaming until the next update
+                    logger.exception("Updating the resume bundle %s-%s failed", bundle.kind, bundle.pk)
+                finally:
+                    cache.delete(bundle.lock_key)
+    finally:
+        with _pending_lock:
+            if _worker is threading.current_thread():
+                _worker = None
+        connection.close()
@@ -0,0 +1,79 @@
+"""
+Streaming zip archives of candidate resumes.
+
+zipfile writes into a write-only buffer that is drained after every
+chunk, so the archive reaches the client while it is being built and only
+one read chunk is held in memory at a time, whatever the number of
+resumes. Without seek() zipfile writes the sizes and CRCs in data
+descriptors after each entry instead of patching the local headers.
+"""
+
+import os
+import zipfile
+
+from django.core.files.storage import default_storage
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer:
+
+    """
+    Write-only file object collecting zipfile's output until drained.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _drain(buffer):
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def unique_arcname(name, used):
+    # Different resumes can share a basename, e.g. 'resume.pdf'
+    base, ext = os.path.splitext(os.path.basename(name))
+    arcname, counter = base + ext, 1
+    while arcname in used:
+        counter += 1
+        arcname = f"{base}_{counter}{ext}"
+    used.add(arcname)
+    return arcname
+
+
+def stream_resume_zip(names, storage=default_storage):
+    """
+    Yield a zip archive of the stored files `names`, chunk by chunk.
+    Files missing from storage are skipped.
+    """
+
+    buffer = _StreamBuffer()
+    used = set()
+    # Resumes (PDF, DOCX) are compressed already, storing them is cheaper
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name in names:
+            try:
+                source = storage.open(name, 'rb')
+            except OSError:
+                continue
+            with source, archive.open(unique_arcname(name, used), 'w') as entry:
+                for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                    entry.write(chunk)
+                    yield from _drain(buffer)
+            yield from _drain(buffer)
+    # Central directory, written when the archive closes
+    yield from _drain(buffer)
@@ -0,0 +1,130 @@
+"""
+Daily hiring-funnel rollups.
+
+ApplicationDailyRollup holds, per job, day of submission and status, how
+many of the applications received that day are currently in that status.
+Submissions add one to their (job, day, status) row (INSERT ... ON
+CONFLICT DO UPDATE), deletions take one off and status changes move one
+between two rows, so the funnel reads O(days) rows however many
+applications there are.
+
+rebuild_rollups() recomputes a range of days from the applications. It
+takes an exclusive advisory lock per day, and increments a shared one, so
+a rebuild never loses or double counts a concurrent submission.
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Application, ApplicationDailyRollup
+from job.models import Job
+
+
+# First key of the per-day advisory locks ('ROLL')
+LOCK_NAMESPACE = 0x524f4c4c
+
+
+def rollup_day(moment):
+    return timezone.localtime(moment).date()
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add `deltas` ({(job uuid, day, status): count}) to the rollups.
+    Positive counts are upserted, negative ones only update existing rows:
+    the rollups of a job being deleted are gone before its applications'
+    post_delete runs, and must not be created again. Counts of deleted
+    jobs are dropped.
+    """
+
+    items = [(job_id, day, status, count) for (job_id, day, status), count in deltas.items() if count]
+    if not items:
+        return
+
+    table = connection.ops.quote_name(ApplicationDailyRollup._meta.db_table)
+    job_table = connection.ops.quote_name(Job._meta.db_table)
+    additions = [item for item in items if item[3] > 0]
+    removals = [item for item in items if item[3] < 0]
+    days = sorted({day.toordinal() for _, day, _, _ in items})
+    # No savepoint: a failure here fails the write it belongs to
+    with transaction.atomic(savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock_shared(%s, day) FROM unnest(%s::integer[]) AS day",
+                [LOCK_NAMESPACE, days],
+            )
+            if removals:
+                values, params = _delta_values(removals)
+                cursor.execute(
+                    f"UPDATE {table} AS rollup SET count = rollup.count + delta.count "
+                    f"FROM (VALUES {values}) AS delta (job_id, day, status, count) "
+                    f"WHERE rollup.job_id = delta.job_id AND rollup.day = delta.day "
+                    f"AND rollup.status = delta.status",
+                    params,
+                )
+            if additions:
+                values, params = _delta_values(additions)
+                cursor.execute(
+                    f"INSERT INTO {table} AS rollup (company_id, job_id, day, status, count) "
+                    f"SELECT job.company_id, delta.job_id, delta.day, delta.status, delta.count "
+                    f"FROM (VALUES {values}) AS delta (job_id, day, status, count) "
+                    f"JOIN {job_table} AS job ON job.uuid = delta.job_id "
+                    f"ON CONFLICT (job_id, day, status) DO UPDATE SET count = rollup.count + EXCLUDED.count",
+                    params,
+                )
+
+
+def _delta_values(items):
+    values = ', '.join(['(%s::uuid, %s::date, %s, %s::integer)'] * len(items))
+    return values, [value for item in items for value in item]
+
+
+def status_change_deltas(rows, previous_status):
+    """
+    Deltas moving the applications `rows` ((uuid, job uuid, application
+    date, status)) out of their `previous_status` ({uuid: status}).
+    """
+
+    deltas = Counter()
+    for application_uuid, job_id, application_date, status in rows:
+        previous = previous_status.get(application_uuid)
+        if previous is None or previous == status:
+            continue
+        day = rollup_day(application_date)
+        deltas[job_id, day, previous] -= 1
+        deltas[job_id, day, status] += 1
+    return deltas
+
+
+def rebuild_rollups(first_day, last_day):
+    """
+    Recompute the rollups of the days from `first_day` to `last_day`
+    included. Returns the number of rollup rows written.
+    """
+
+    table = connection.ops.quote_name(ApplicationDailyRollup._meta.db_table)
+    application_table = connection.ops.quote_name(Application._meta.db_table)
+    job_table = connection.ops.quote_name(Job._meta.db_table)
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min))
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, day) FROM generate_series(%s::integer, %s::integer) AS day",
+                [LOCK_NAMESPACE, first_day.toordinal(), last_day.toordinal()],
+            )
+            cursor.execute(f"DELETE FROM {table} WHERE day BETWEEN %s AND %s", [first_day, last_day])
+            cursor.execute(
+                f"INSERT INTO {table} (company_id, job_id, day, status, count) "
+                f"SELECT job.company_id, application.job_id, "
+                f"(application.application_date AT TIME ZONE %s)::date, application.status, count(*) "
+                f"FROM {application_table} AS application "
+                f"JOIN {job_table} AS job ON job.uuid = application.job_id "
+                f"WHERE application.application_date >= %s AND application.application_date < %s "
+                f"GROUP BY 1, 2, 3, 4",
+                [timezone.get_current_timezone_name(), start, end],
+            )
+            return cursor.rowcount
@@ -1,7 +1,11 @@
 from rest_framework import serializers
+from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
 from .models import Application
 from account.models import CandidateProfile
 from job.models import Job
+from utils.fast_read import Projection, to_datetime
 
 class ApplicationSerializer(serializers.ModelSerializer):
 
@@ -14,35 +18,29 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
     candidate_name = serializers.CharField(source='candidate.name', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
-    company_name = serializers.CharField(source='job.company.name', read_only=True)
+    company_name = serializers.CharField(source='job.company.company_name', read_only=True)
 
     class Meta:
         model = Application
-        fields = ['uuid', 'candidate_name', 'job_title', 'company_name', 'application_date', 'status', 'candidate', 'job']
+        fields = [
+            'uuid', 'candidate_name', 'job_title', 'company_name', 'application_date', 'status', 'score',
+            'is_archived', 'candidate', 'job',
+        ]
 
-    
-    def validate(self, attrs):
-
-        """
-        Custom validation method to ensure the uniqueness of applications.
-
-        Checks if an application already exists for the given candidate and job combination.
-        """
-
-        request = self.context.get('request')
-        if not request:
-            raise serializers.ValidationError("request context is missing")
-        
-        candidate = getattr(request.user, 'candidate_profile', None)
-        if not candidate:
-            raise serializers.ValidationError("Candidate profile not found")
-        
-        
-        job = attrs.get('job')
-        if Application.objects.filter(candidate=candidate, job=job).exists():
-            raise serializers.ValidationError({'error': 'Application already exists.'})
-        
-        return attrs
+
+# ApplicationSerializer's output for the fast read path
+APPLICATION_PROJECTION = Projection([
+    ('uuid', 'uuid'),
+    ('candidate_name', 'candidate__name'),
+    ('job_title', 'job__title'),
+    ('company_name', 'job__company__company_name'),
+    ('application_date', 'application_date', to_datetime),
+    ('status', 'status'),
+    ('score', 'score'),
+    ('is_archived', 'is_archived'),
+    ('candidate', 'candidate_id'),
+    ('job', 'job_id'),
+])
     
 
 class ApplicationUpdateSerializer(serializers.ModelSerializer):
@@ -54,9 +52,59 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
     """
     
 
-    company_name = serializers.CharField(source='job.company.name', read_only=True)
+    company_name = serializers.CharField(source='job.company.company_name', read_only=True)
     
     class Meta:
         model = Application
         fields = '__all__'
 
+
+class BulkApplicationStatusSerializer(serializers.Serializer):
+
+    """
+    Payload of a bulk status update: the target status, and either the
+    applications to update or a filter selecting them among the company's
+    applications (e.g. every pending application of one job).
+    """
+
+    status = serializers.ChoiceField(choices=Application._meta.get_field('status').choices)
+    applications = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False,
+        max_length=settings.APPLICATION_BULK_MAX_ITEMS,
+    )
+    job = serializers.UUIDField(required=False)
+    current_status = serializers.ChoiceField(
+        choices=Application._meta.get_field('status').choices, required=False)
+
+    def validate(self, data):
+        has_filter = 'job' in data or 'current_status' in data
+        if 'applications' in data and has_filter:
+            raise serializers.ValidationError("Give either applications or a filter (job, current_status), not both.")
+        if 'applications' not in data and not has_filter:
+            raise serializers.ValidationError("Give applications or a filter (job, current_status).")
+        # Duplicates would get several outcomes
+        if 'applications' in data:
+            data['applications'] = list(dict.fromkeys(data['applications']))
+        return data
+
+
+class FunnelQuerySerializer(serializers.Serializer):
+
+    """
+    Query parameters of the hiring funnel: the day range (the last 30 days
+    by default) and optionally one job.
+    """
+
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+    job = serializers.UUIDField(required=False)
+
+    def validate(self, data):
+        data.setdefault('until', timezone.localdate())
+        data.setdefault('since', data['until'] - timedelta(days=29))
+        if data['since'] > data['until']:
+            raise serializers.ValidationError("since must not be after until.")
+        if (data['until'] - data['since']).days >= settings.APPLICATION_FUNNEL_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"The range is limited to {settings.APPLICATION_FUNNEL_MAX_DAYS} days.")
+        return data
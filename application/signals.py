@@ -0,0 +1,101 @@
+from collections import Counter
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from .models import Application
+from .resume_bundles import schedule_bundle_update
+from .ranking import CANDIDATE_SCORE_FIELDS, JOB_SCORE_FIELDS, schedule_rescore
+from .rollups import apply_rollup_deltas, rollup_day, status_change_deltas
+from account.models import CandidateProfile
+from experience.models import Experience
+from job.models import Job
+from job.api.signals import jobs_bulk_changed
+
+# Sent after queryset-level writes (update()) that bypass post_save, with
+# the primary keys of the affected applications, the names of the updated
+# fields and their status before the write ({pk: status}). Like post_save
+# it is sent inside the write's transaction
+applications_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Application)
+def add_to_resume_bundles(sender, instance, created, **kwargs):
+    # Status changes do not touch the bundles
+    if created:
+        schedule_bundle_update('job', instance.job_id)
+
+
+@receiver(post_delete, sender=Application)
+def remove_from_resume_bundles(sender, instance, **kwargs):
+    schedule_bundle_update('job', instance.job_id)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def refresh_resume_bundles(sender, instance, **kwargs):
+    # A new upload usually gets a new name, but a storage overwriting
+    # files keeps it: the bundled copy is hashed again
+    if instance.resume:
+        schedule_bundle_update('candidate', instance.pk, recheck=[instance.resume.name])
+
+
+@receiver(post_save, sender=Application)
+def score_new_application(sender, instance, created, **kwargs):
+    if created:
+        schedule_rescore('application', [instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def rescore_job_applicants(sender, instance, created, update_fields=None, **kwargs):
+    # A new job has no applicants; saves of unscored fields change nothing
+    if created or (update_fields is not None and not JOB_SCORE_FIELDS.intersection(update_fields)):
+        return
+    schedule_rescore('job', [instance.pk])
+
+
+@receiver(jobs_bulk_changed, sender=Job)
+def rescore_bulk_changed_job_applicants(sender, pks, update_fields=None, **kwargs):
+    if update_fields is None or JOB_SCORE_FIELDS.intersection(update_fields):
+        schedule_rescore('job', pks)
+
+
+@receiver(post_save, sender=CandidateProfile)
+def rescore_candidate_applications(sender, instance, created, update_fields=None, **kwargs):
+    # A new candidate has no applications; saves of unscored fields change nothing
+    if created or (update_fields is not None and not CANDIDATE_SCORE_FIELDS.intersection(update_fields)):
+        return
+    schedule_rescore('candidate', [instance.pk])
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def rescore_candidate_experience(sender, instance, **kwargs):
+    schedule_rescore('candidate', [instance.candidate_id])
+
+
+@receiver(post_save, sender=Application)
+def update_application_rollups(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_loaded_status', None)
+    deltas = Counter()
+    day = rollup_day(instance.application_date)
+    if created:
+        deltas[instance.job_id, day, instance.status] += 1
+    elif previous is not None and previous != instance.status:
+        deltas[instance.job_id, day, previous] -= 1
+        deltas[instance.job_id, day, instance.status] += 1
+    instance._loaded_status = instance.status
+    apply_rollup_deltas(deltas)
+
+
+@receiver(post_delete, sender=Application)
+def remove_from_application_rollups(sender, instance, **kwargs):
+    status = getattr(instance, '_loaded_status', None) or instance.status
+    apply_rollup_deltas({(instance.job_id, rollup_day(instance.application_date), status): -1})
+
+
+@receiver(applications_bulk_changed, sender=Application)
+def move_bulk_changed_application_rollups(sender, pks, update_fields=None, previous_status=None, **kwargs):
+    if not previous_status or (update_fields is not None and 'status' not in update_fields):
+        return
+    rows = Application.objects.filter(pk__in=pks).values_list('uuid', 'job_id', 'application_date', 'status')
+    apply_rollup_deltas(status_change_deltas(rows, previous_status))
@@ -1,3 +1,198 @@
+import uuid
+from collections import Counter
+from unittest import mock
+
+from django.db import connection, transaction
+from django.db.models import Count
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from account.models import User, CompanyProfile, CandidateProfile
+from job.models import Job
+from .models import Application, ApplicationDailyRollup
+from .rollups import rollup_day
+
+
+class ApplicationCreateTests(APITestCase):
+
+    def setUp(self):
+        company_user = User.objects.create_user('company@example.com', 'secret123', role=User.COMPANY, is_active=True)
+        company = CompanyProfile.objects.create(user=company_user, company_name='Acme', industry='IT', location='Pune')
+        self.job = Job.objects.create(company=company, title='Backend', salary=10)
+        self.user = User.objects.create_user('candidate@example.com', 'secret123', role=User.CANDIDATE, is_active=True)
+        self.candidate = CandidateProfile.objects.create(user=self.user, name='Dev', location='Pune')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('application:candidate_application')
+
+    def test_applies(self):
+        response = self.client.post(self.url, {'job': str(self.job.uuid)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Application.objects.filter(candidate=self.candidate, job=self.job).exists())
+
+    def test_duplicate_application_is_rejected(self):
+        Application.objects.create(candidate=self.candidate, job=self.job)
+
+        response = self.client.post(self.url, {'job': str(self.job.uuid)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], "You have already applied for this job.")
+        self.assertEqual(Application.objects.filter(candidate=self.candidate, job=self.job).count(), 1)
+
+    def test_unknown_job_is_not_found(self):
+        response = self.client.post(self.url, {'job': str(uuid.uuid4())}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Application.objects.exists())
+
+    def test_malformed_job_is_not_found(self):
+        response = self.client.post(self.url, {'job': 'not-a-uuid'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_missing_job_is_rejected(self):
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inactive_job_is_rejected(self):
+        self.job.is_active = False
+        self.job.save(update_fields=['is_active'])
+
+        response = self.client.post(self.url, {'job': str(self.job.uuid)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Application.objects.exists())
+
+
+class ApplicationListTests(APITestCase):
+
+    def setUp(self):
+        self.company_user = User.objects.create_user(
+            'company@example.com', 'secret123', role=User.COMPANY, is_active=True)
+        company = CompanyProfile.objects.create(
+            user=self.company_user, company_name='Acme', industry='IT', location='Pune')
+        job = Job.objects.create(company=company, title='Backend', salary=10)
+        self.applications = []
+        for number in range(2):
+            user = User.objects.create_user(
+                f'candidate{number}@example.com', 'secret123', role=User.CANDIDATE, is_active=True)
+            candidate = CandidateProfile.objects.create(user=user, name=f'Dev {number}', location='Pune')
+            self.applications.append(Application.objects.create(candidate=candidate, job=job))
+        Application.objects.filter(pk=self.applications[0].pk).update(is_archived=True)
+        self.client.force_authenticate(self.company_user)
+        self.url = reverse('application:application total')
+
+    def listed(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(str(row['uuid']), row['is_archived']) for row in response.data['results']]
+
+    def test_archived_applications_are_left_out(self):
+        self.assertEqual(self.listed(), [(str(self.applications[1].uuid), False)])
+
+    def test_archived_applications_on_request(self):
+        self.assertEqual(self.listed(archived='true'), [(str(self.applications[0].uuid), True)])
+
+
+class ApplicationRollupTests(APITestCase):
+
+    def setUp(self):
+        self.company_user = User.objects.create_user(
+            'company@example.com', 'secret123', role=User.COMPANY, is_active=True)
+        company = CompanyProfile.objects.create(
+            user=self.company_user, company_name='Acme', industry='IT', location='Pune')
+        self.jobs = [Job.objects.create(company=company, title=title, salary=10) for title in ('Backend', 'Frontend')]
+        self.applications = []
+        for number in range(6):
+            user = User.objects.create_user(
+                f'candidate{number}@example.com', 'secret123', role=User.CANDIDATE, is_active=True)
+            candidate = CandidateProfile.objects.create(user=user, name=f'Dev {number}', location='Pune')
+            self.applications.append(Application.objects.create(candidate=candidate, job=self.jobs[number % 2]))
+
+    def assertRollupsMatch(self):
+        # Every application was submitted today
+        day = rollup_day(self.applications[0].application_date)
+        expected = Counter({
+            (row['job_id'], day, row['status']): row['count']
+            for row in Application.objects.values('job_id', 'status').annotate(count=Count('pk'))
+        })
+        rollups = Counter({
+            row[:3]: row[3]
+            for row in ApplicationDailyRollup.objects.values_list('job_id', 'day', 'status', 'count')
+            if row[3]
+        })
+        self.assertEqual(rollups, expected)
+        self.assertFalse(ApplicationDailyRollup.objects.filter(count__lt=0).exists())
+
+    def test_create(self):
+        self.assertRollupsMatch()
+        self.assertEqual(
+            ApplicationDailyRollup.objects.get(job=self.jobs[0], status='Pending').count, 3)
+
+    def test_status_change(self):
+        application = Application.objects.get(pk=self.applications[0].pk)
+        application.status = 'Accepted'
+        application.save()
+        self.assertRollupsMatch()
+
+        application.status = 'Declined'
+        application.save()
+        self.assertRollupsMatch()
+
+    def test_bulk_status_change(self):
+        self.client.force_authenticate(self.company_user)
+
+        response = self.client.patch(
+            reverse('application:application_bulk_status'),
+            {'status': 'Accepted', 'job': str(self.jobs[0].uuid), 'current_status': 'Pending'},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertRollupsMatch()
+
+    def test_application_delete(self):
+        Application.objects.get(pk=self.applications[0].pk).delete()
+
+        self.assertRollupsMatch()
+
+    def test_job_delete(self):
+        job = self.jobs[0]
+        with transaction.atomic():
+            job.delete()
+        # The rollup foreign keys are deferred, check them now
+        connection.check_constraints()
+
+        self.assertFalse(ApplicationDailyRollup.objects.filter(job_id=job.pk).exists())
+        self.assertRollupsMatch()
+
+
+class CandidateRescoreTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('candidate@example.com', 'secret123', role=User.CANDIDATE, is_active=True)
+        self.candidate = CandidateProfile.objects.create(user=user, name='Dev', location='Pune')
+
+    @mock.patch('application.signals.schedule_rescore')
+    def test_save_of_scored_fields_rescores(self, schedule_rescore):
+        self.candidate.skills = 'python, django'
+        self.candidate.save(update_fields=['skills'])
+
+        schedule_rescore.assert_called_once_with('candidate', [self.candidate.pk])
+
+    @mock.patch('application.signals.schedule_rescore')
+    def test_full_save_rescores(self, schedule_rescore):
+        self.candidate.save()
+
+        schedule_rescore.assert_called_once_with('candidate', [self.candidate.pk])
+
+    @mock.patch('application.signals.schedule_rescore')
+    def test_save_of_unscored_fields_does_not_rescore(self, schedule_rescore):
+        self.candidate.location = 'Mumbai'
+        self.candidate.save(update_fields=['location'])
 
-# Create your tests here.
+        schedule_rescore.assert_not_called()
@@ -1,5 +1,6 @@
 # import os
 # os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+from uuid import UUID
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -9,19 +10,30 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model
 from rest_framework import generics
-from django.http import HttpResponse
-import zipfile
-import os
-from django.conf import settings
-from django.contrib import messages
-
-
-from .models import Application
-from .serializers import ApplicationSerializer, ApplicationUpdateSerializer
+from django.http import StreamingHttpResponse
+from django.db import connection, transaction, IntegrityError
+from django.db.models import Sum
+from datetime import timedelta
+
+
+from .models import Application, ApplicationDailyRollup
+from .serializers import (
+    ApplicationSerializer, ApplicationUpdateSerializer, BulkApplicationStatusSerializer, FunnelQuerySerializer,
+    APPLICATION_PROJECTION,
+)
+from .signals import applications_bulk_changed
 from job.models import Job 
 from account.api.permissions import *
+from account.api.authentication import CandidateJWTAuthentication
 from account.models import CandidateProfile
 from account.models import CompanyProfile
+from utils.fast_read import FastReadMixin
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.exceptions import ValidationError
+from job.api.pagination import KeysetPagination
+from .filters import ApplicationFilter
+from .resumes import stream_resume_zip
+from .resume_bundles import ResumeBundle, schedule_bundle_update
 
 User = get_user_model()
 
@@ -29,6 +41,20 @@ User = get_user_model()
 
 
 # Create your views here.
+
+def lock_job_for_application(job_uuid):
+    """
+    Whether the job `job_uuid` is active (None if there is no such job),
+    read under a FOR KEY SHARE lock held until the transaction ends.
+    """
+
+    job_table = connection.ops.quote_name(Job._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT is_active FROM {job_table} WHERE uuid = %s FOR KEY SHARE", [job_uuid])
+        row = cursor.fetchone()
+    return None if row is None else row[0]
+
+
 class ApplicationCreateAPIView(APIView):
 
     """
@@ -36,10 +62,17 @@ class ApplicationCreateAPIView(APIView):
 
     Allows authenticated candidate users to apply for a job by providing the job UUID.
     Ensures that a candidate cannot apply for the same job multiple times.
+
+    The candidate profile is loaded with the user at authentication. The
+    job is read with a FOR KEY SHARE lock, which concurrent applicants do
+    not contend on but which keeps the expiry sweeper off the job until
+    the application is in, so expired (inactive) jobs are rejected. The
+    application is then a single INSERT: duplicates are rejected by the
+    (candidate, job) unique constraint.
     """
 
     permission_classes = [IsAuthenticated,IsCandidateUser]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CandidateJWTAuthentication]
     
 
     def post(self, request):
@@ -49,56 +82,80 @@ class ApplicationCreateAPIView(APIView):
         if not job_uuid:
             return Response({"message": "Please provide the job post UUID."},
                             status=status.HTTP_400_BAD_REQUEST)
-        
-        # Get the job post instance usign uuid
-        job = get_object_or_404(Job, uuid=job_uuid)
 
         try:
-            candidate_profile = CandidateProfile.objects.get(user=request.user)
+            job_uuid = UUID(str(job_uuid))
+        except ValueError:
+            return Response({"message": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        except User.DoesNotExist:
-            return Response({"message": "User not found."},
-                            status=status.HTTP_400_BAD_REQUEST)
-        
+        try:
+            candidate_profile = request.user.candidate_profile
         except CandidateProfile.DoesNotExist:
             return Response({"message": "Candidate profile not found."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        # Check if the candidate has already applied for this job post
-        if Application.objects.filter(candidate=candidate_profile, job=job).exists():
+        try:
+            with transaction.atomic():
+                is_active = lock_job_for_application(job_uuid)
+                if is_active is None:
+                    return Response({"message": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+                if not is_active:
+                    return Response({"message": "This job is no longer accepting applications."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                Application.objects.create(candidate=candidate_profile, job_id=job_uuid)
+        except IntegrityError as e:
+            # The job row is locked, so the only expected violation is the
+            # duplicate; anything else is a real error
+            constraint = getattr(getattr(e.__cause__, 'diag', None), 'constraint_name', None)
+            if constraint != 'application_candidate_job_uniq':
+                raise
             return Response({"message": "You have already applied for this job."},
                             status=status.HTTP_400_BAD_REQUEST)
-        
-
-        # prepare application data
-        application_data = {
-            'candidate' : candidate_profile.id,
-            'job' : job.id
-        }
 
+        return Response({"message": "Application submitted successfully."}, status=status.HTTP_201_CREATED)
 
-        # Creating an Application instance
-        serializer = ApplicationSerializer(data=application_data, context={'request':request})
 
+def get_visible_applications(user):
+    """
+    Applications `user` may list: all of them for admins, those to the
+    company's own jobs otherwise. Joined with the candidate and the job's
+    company and limited to the listed columns, so a page is one query.
+    """
 
-        if serializer.is_valid():
-            serializer.save()
-            return Response({"message": "Application submitted successfully."}, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    applications = Application.objects.select_related('candidate', 'job__company').only(
+        'uuid', 'application_date', 'status', 'score', 'is_archived', 'candidate_id', 'job_id',
+        'candidate__name', 'job__title', 'job__company__company_name',
+    )
+    if not user.is_staff:
+        applications = applications.filter(job__company__user=user)
+    return applications
 
 
-class ApplicationsListAPIView(generics.ListAPIView):
+class ApplicationsListAPIView(FastReadMixin, generics.ListAPIView):
 
     """
     API view for retrieving a list of job applications.
 
-    Allows admin users or company users to view all job applications.
+    Allows admin users to view all job applications and company users the
+    applications to their own jobs, newest first, with cursor pagination.
+    Filter with `job`, `status`, `applied_after` and `applied_before`, and
+    rank applicants with `ordering=score` (best match first). Applications
+    to expired jobs are archived and only listed with `archived=true`.
+    Rows are served through the fast read path (see utils.fast_read).
     """
 
-    queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    projection = APPLICATION_PROJECTION
     permission_classes = [IsAdminUser | IsCompanyUser]
     authentication_classes = [JWTAuthentication]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ApplicationFilter
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-application_date', '-uuid')
+    cursor_orderings = {'score': ('-score', '-uuid')}
+
+    def get_queryset(self):
+        return get_visible_applications(self.request.user)
 
 
 
@@ -137,6 +194,72 @@ class ApplicationUpdateAPIView(APIView):
 
 
 
+class BulkApplicationStatusAPIView(APIView):
+
+    """
+    API view for changing the status of many applications at once.
+
+    PATCH: {"status": "Declined", "applications": [<uuid>, ...]} or, with a
+    filter instead of the list, {"status": "Declined", "job": <uuid>,
+    "current_status": "Pending"}. Ownership is checked and the applications
+    are locked in one query, then updated with a single UPDATE.
+
+    Returns one result per application: updated, unchanged, or for listed
+    applications not_found / forbidden.
+    """
+
+    permission_classes = [IsAuthenticated, IsCompanyUser]
+    authentication_classes = [JWTAuthentication]
+
+    def patch(self, request):
+        serializer = BulkApplicationStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        target = data['status']
+
+        with transaction.atomic():
+            if 'applications' in data:
+                applications = Application.objects.filter(uuid__in=data['applications'])
+            else:
+                applications = Application.objects.filter(job__company__user=request.user)
+                if 'job' in data:
+                    applications = applications.filter(job_id=data['job'])
+                if 'current_status' in data:
+                    applications = applications.filter(status=data['current_status'])
+
+            # Locks the applications, not the jobs and companies joined in
+            found = {
+                application_uuid: (current_status, owner)
+                for application_uuid, current_status, owner in applications
+                .select_for_update(of=('self',)).order_by('pk')
+                .values_list('uuid', 'status', 'job__company__user')
+            }
+
+            results, previous_status = [], {}
+            for application_uuid in data.get('applications', found):
+                if application_uuid not in found:
+                    results.append({'uuid': application_uuid, 'result': 'not_found'})
+                    continue
+                current_status, owner = found[application_uuid]
+                if owner != request.user.pk:
+                    results.append({'uuid': application_uuid, 'result': 'forbidden'})
+                    continue
+                result = 'unchanged' if current_status == target else 'updated'
+                results.append({'uuid': application_uuid, 'result': result, 'previous_status': current_status})
+                if result == 'updated':
+                    previous_status[application_uuid] = current_status
+
+            if previous_status:
+                Application.objects.filter(uuid__in=list(previous_status)).update(status=target)
+                applications_bulk_changed.send(
+                    sender=Application, pks=list(previous_status), update_fields=['status'],
+                    previous_status=previous_status,
+                )
+
+        return Response({'status': target, 'updated': len(previous_status), 'results': results},
+                        status=status.HTTP_200_OK)
+
+
 class ApplicationDeleteAPIView(APIView):
 
     """
@@ -165,15 +288,25 @@ class ApplicationAPIView(APIView):
 
     """
     API view for retrieving , updating and deleting job application
+
+    GET lists applications like ApplicationsListAPIView: scoped to the
+    caller's company, filterable and cursor paginated.
     """
 
     permission_classes = [IsAuthenticated, (IsAdminUser | IsCompanyUser)]
     authentication_classes = [JWTAuthentication]
+    cursor_ordering = ApplicationsListAPIView.cursor_ordering
+    cursor_orderings = ApplicationsListAPIView.cursor_orderings
 
     def get(self, request):
-        applications = Application.objects.all()
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        filterset = ApplicationFilter(request.query_params, queryset=get_visible_applications(request.user))
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(filterset.qs, request, view=self)
+        serializer = ApplicationSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def patch(self, request, uuid):
         application = get_object_or_404(Application, uuid=uuid)
@@ -207,6 +340,17 @@ class ApplicationAPIView(APIView):
 
 
 class DownloadResumeAPIView(APIView):
+
+    """
+    API view for downloading the resumes of every candidate who applied to
+    one of the company's jobs (or to the job given by ?job=<uuid>) as a zip
+    archive.
+
+    The prebuilt bundle is served when it is up to date; otherwise the
+    archive is streamed while it is built and the bundle is updated in the
+    background for the next download.
+    """
+
     permission_classes = [IsAuthenticated, IsCompanyUser]
     authentication_classes = [JWTAuthentication]
 
@@ -216,39 +360,72 @@ class DownloadResumeAPIView(APIView):
         except CompanyProfile.DoesNotExist:
             return Response({"message": "Company profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        # Retrieve all the jobs posted by the company
-        jobs = Job.objects.filter(company=company_profile)
+        job_uuid = request.query_params.get('job')
+        if job_uuid:
+            try:
+                job_uuid = UUID(job_uuid)
+            except ValueError:
+                return Response({"job": ["Must be a valid UUID."]}, status=status.HTTP_400_BAD_REQUEST)
+            job = get_object_or_404(Job, uuid=job_uuid, company=company_profile)
+            bundle = ResumeBundle('job', job.uuid)
+            zip_filename = f"{company_profile.company_name}_{job.title}_resumes.zip"
+        else:
+            bundle = ResumeBundle('company', company_profile.uuid)
+            zip_filename = f"{company_profile.company_name}_resumes.zip"
 
-        # Create a zip file containing all resumes
-        zip_filename = f"{company_profile.company_name}_resumes.zip"
-        zip_file_path = os.path.join(settings.MEDIA_ROOT, zip_filename)
-        
+        state = bundle.current_state()
+        if bundle.is_fresh(state):
+            return bundle.response(zip_filename)
+
+        schedule_bundle_update(bundle.kind, bundle.pk, create=True)
+        response = StreamingHttpResponse(stream_resume_zip(sorted(state)), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
+        return response
+
+
+class ApplicationFunnelAPIView(APIView):
+
+    """
+    API view for the hiring funnel of the company's jobs (or of one job with
+    ?job=<uuid>): per day of submission between `since` and `until`, the
+    applications received and how many of them are pending, accepted and
+    declined.
+
+    Served from the daily rollups, so the cost grows with the number of
+    days, not of applications.
+    """
+
+    permission_classes = [IsAuthenticated, IsCompanyUser]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
         try:
-            with zipfile.ZipFile(zip_file_path, 'w') as zipf:
-                for job in jobs:
-                    applications = Application.objects.filter(job=job)
-                    for application in applications:
-                        candidate_profile = application.candidate
-                        if candidate_profile.resume and candidate_profile.resume.name:
-                            try:
-                                resume_path = candidate_profile.resume.path
-                                zipf.write(resume_path, os.path.basename(resume_path))
-                            except ValueError as e:
-                                print(f"Error: {e}")
-                    
-        # Prepare response to download zip file
-            with open(zip_file_path, 'rb') as zipf:
-                response = HttpResponse(zipf.read(), content_type='application/zip')
-                response['Content-Disposition'] = f'attachment; filename={zip_filename}'
-
-                # Optionally use Django messages framework
-                messages.success(request, "Resumes downloaded successfully.")
-
-            # Remove the zip file after sending the response
-            if os.path.exists(zip_file_path):
-                os.remove(zip_file_path)
-
-            return response
-        
-        except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            company_profile = request.user.company_profile
+        except CompanyProfile.DoesNotExist:
+            return Response({"message": "Company profile not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = FunnelQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        since, until = serializer.validated_data['since'], serializer.validated_data['until']
+        job_uuid = serializer.validated_data.get('job')
+
+        rollups = ApplicationDailyRollup.objects.filter(company=company_profile, day__range=(since, until))
+        if job_uuid:
+            rollups = rollups.filter(job_id=job_uuid)
+        counts = rollups.values_list('day', 'status').annotate(total=Sum('count')).order_by()
+
+        empty = {'received': 0, 'pending': 0, 'accepted': 0, 'declined': 0}
+        days = {since + timedelta(days=offset): dict(empty) for offset in range((until - since).days + 1)}
+        totals = dict(empty)
+        for day, application_status, total in counts:
+            for row in (days[day], totals):
+                row['received'] += total
+                row[application_status.lower()] += total
+
+        return Response({
+            'since': since,
+            'until': until,
+            'job': job_uuid,
+            'days': [{'day': day, **row} for day, row in days.items()],
+            'totals': totals,
+        }, status=status.HTTP_200_OK)
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third party apps
     'corsheaders',
     'rest_framework',
@@ -234,6 +235,51 @@ CACHES = {
 
 CACHE_TTL = 60 * 60  # 60 minutes
 
+
+# Job search: 'postgres' (full-text search) or 'memory' (in-process BM25 index)
+JOB_SEARCH_BACKEND = os.environ.get('JOB_SEARCH_BACKEND', 'postgres')
+JOB_SEARCH_INDEX_PATH = BASE_DIR / 'var' / 'job_search.idx'
+JOB_SEARCH_INDEX_REFRESH_INTERVAL = 60  # seconds between checks for writes made by other processes
+JOB_SEARCH_MAX_RESULTS = 1000  # results of one search, counted after the JobFilter predicates
+
+# Seconds between checks for job writes made by other processes
+SALARY_STATS_REFRESH_INTERVAL = 60
+
+# Candidate job recommendations (in-process TF-IDF matrix)
+RECOMMENDATIONS_REFRESH_INTERVAL = 60  # seconds between checks for writes made by other processes
+RECOMMENDATIONS_MAX_RESULTS = 50
+
+# Maximum number of jobs in one bulk post
+JOB_BULK_MAX_ITEMS = 500
+
+# Maximum number of applications listed in one bulk status update
+APPLICATION_BULK_MAX_ITEMS = 1000
+
+# Longest day range served by the hiring funnel
+APPLICATION_FUNNEL_MAX_DAYS = 366
+
+# Seconds between flushes of the buffered job view counters
+JOB_VIEWS_FLUSH_INTERVAL = 10
+
+# Pre-rendered public job feed, rebuilt on job/company writes when enabled
+STATIC_FEED_ENABLED = os.environ.get('STATIC_FEED_ENABLED') == 'True'
+STATIC_FEED_ROOT = BASE_DIR / 'var' / 'static_feed'
+STATIC_FEED_BASE_URL = os.environ.get('STATIC_FEED_BASE_URL', 'http://localhost:8000')  # host of the page links
+STATIC_FEED_PAGES = 5
+STATIC_FEED_DEBOUNCE = 2  # seconds a rebuild waits for more writes
+
+# Prebuilt resume bundles, kept outside MEDIA_ROOT since they are private.
+# RESUME_BUNDLE_SENDFILE hands the download to the front proxy:
+# 'x-accel-redirect' (nginx, internal location RESUME_BUNDLE_ACCEL_PREFIX
+# aliased to RESUME_BUNDLE_ROOT), 'x-sendfile' (Apache) or '' to serve it from Django
+RESUME_BUNDLE_ROOT = BASE_DIR / 'var' / 'resume_bundles'
+RESUME_BUNDLE_SENDFILE = os.environ.get('RESUME_BUNDLE_SENDFILE', '')
+RESUME_BUNDLE_ACCEL_PREFIX = '/protected/resume-bundles/'
+RESUME_BUNDLE_READ_WORKERS = 8  # threads reading resumes from storage
+
+# Processes extracting the text of uploaded resumes for the candidate search
+RESUME_TEXT_WORKERS = 2
+
 INTERNAL_IPS = [
     # ...
     "127.0.0.1",
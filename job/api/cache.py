@@ -0,0 +1,61 @@
+"""
+Response caching helpers for the public job listing.
+
+Every key embeds the current `jobs` version, which the signals in
+`job.api.signals` bump whenever a job is created, updated, deleted or
+expired, so stale pages simply stop being looked up.
+"""
+
+import hashlib
+import json
+
+from utils.cache_versions import get_version, bump_version
+
+JOBS_VERSION = 'jobs'
+
+# Params whose filters match case-insensitively, so 'Python' and 'python'
+# can share one cache entry
+CASE_INSENSITIVE_PARAMS = {'search', 'keyword', 'location', 'company'}
+
+
+def get_jobs_version():
+    return get_version(JOBS_VERSION)
+
+
+def bump_jobs_version():
+    return bump_version(JOBS_VERSION)
+
+
+def normalize_query_params(query_params, param_names, defaults=None):
+    """
+    Reduce the query string to a sorted list of the params that affect
+    the result, with whitespace collapsed and default values dropped.
+    """
+
+    defaults = defaults or {}
+    normalized = []
+    for name in sorted(set(param_names)):
+        values = []
+        for value in query_params.getlist(name):
+            value = ' '.join(value.split())
+            if name in CASE_INSENSITIVE_PARAMS:
+                value = value.lower()
+            if value and value != defaults.get(name):
+                values.append(value)
+        if values:
+            normalized.append([name, sorted(values)])
+    return normalized
+
+
+def build_jobs_cache_key(prefix, request, param_names, defaults=None):
+    """
+    Build a versioned cache key for a job listing request.
+
+    The host is part of the key because paginated responses carry
+    absolute `next`/`previous` links.
+    """
+
+    params = normalize_query_params(request.query_params, param_names, defaults)
+    payload = json.dumps([request.get_host(), params], separators=(',', ':'))
+    digest = hashlib.md5(payload.encode()).hexdigest()
+    return f"jobs:{prefix}:v{get_jobs_version()}:{digest}"
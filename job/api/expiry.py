@@ -0,0 +1,67 @@
+"""
+Batched expiry of jobs whose last date has passed.
+
+Expired jobs are deactivated, not deleted, so their applications are kept
+and archived instead of being cascade-deleted. Writes that give a job a
+new last date set it active again (or inactive) with is_job_live() and
+restore (or archive) its applications with archive_job_applications().
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Job
+from .signals import jobs_bulk_changed
+
+
+def is_job_live(last_date, now=None):
+    return last_date >= (now or timezone.now())
+
+
+def archive_job_applications(pks, archived=True):
+    """
+    Archive the applications of the jobs `pks`, or with `archived` False
+    restore them, when the jobs expire or are given a new last date.
+    """
+
+    from application.models import Application
+
+    Application.objects.filter(job__in=pks, is_archived=not archived).update(is_archived=archived)
+
+
+def expire_jobs_batch(now, batch_size):
+    """
+    Deactivate up to `batch_size` expired jobs and archive their
+    applications in one transaction. Returns the number of jobs expired.
+    """
+
+    with transaction.atomic():
+        # Served by the partial (is_active, last_date) index. Rows locked by
+        # a concurrent sweeper are skipped rather than waited for.
+        pks = list(
+            Job.objects.filter(is_active=True, last_date__lt=now)
+            .order_by()
+            .select_for_update(skip_locked=True)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return 0
+        Job.objects.filter(pk__in=pks).update(is_active=False, updated_at=now)
+        archive_job_applications(pks)
+
+    jobs_bulk_changed.send(sender=Job, pks=pks, update_fields={'is_active', 'updated_at'})
+    return len(pks)
+
+
+def expire_jobs(batch_size=1000, now=None):
+    """
+    Expire every job whose last date is before `now`, one batch at a time.
+    Yields the size of each batch.
+    """
+
+    now = now or timezone.now()
+    while True:
+        expired_count = expire_jobs_batch(now, batch_size)
+        if not expired_count:
+            return
+        yield expired_count
@@ -0,0 +1,49 @@
+"""
+NDJSON export of the job catalogue.
+
+Rows are read through a server-side cursor in fixed-size chunks and
+encoded one JSON object per line, so memory use does not depend on the
+number of jobs exported.
+"""
+
+import orjson
+
+from utils.fast_read import Projection, to_datetime
+
+EXPORT_CHUNK_SIZE = 2000
+
+JOB_EXPORT_PROJECTION = Projection([
+    ('uuid', 'uuid'),
+    ('company_name', 'company__company_name'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('location', 'location'),
+    ('job_type', 'job_type'),
+    ('education', 'education'),
+    ('it_industry', 'it_industry'),
+    ('experience', 'experience'),
+    ('salary', 'salary'),
+    ('positions', 'positions'),
+    ('last_date', 'last_date', to_datetime),
+    ('created_at', 'created_at', to_datetime),
+])
+
+
+def iter_job_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the jobs of `queryset` as NDJSON, one bytes block per chunk of
+    `chunk_size` rows.
+    """
+
+    project = JOB_EXPORT_PROJECTION.project
+    lines = []
+    rows = JOB_EXPORT_PROJECTION.values(queryset).iterator(chunk_size=chunk_size)
+    for row in rows:
+        lines.append(orjson.dumps(project(row)))
+        if len(lines) == chunk_size:
+            lines.append(b'')
+            yield b'\n'.join(lines)
+            lines = []
+    if lines:
+        lines.append(b'')
+        yield b'\n'.join(lines)
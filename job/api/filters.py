@@ -1,19 +1,37 @@
 from django_filters import FilterSet, ChoiceFilter, NumberFilter, CharFilter
 from ..models import Job, JobType, Education, Experience
+from . import lookups  # registers the trigram_contains lookup
+
+
+class MatchMode:
+    CONTAINS = 'contains'
+    FUZZY = 'fuzzy'
+
+    CHOICES = [
+        (CONTAINS, 'Contains'),
+        (FUZZY, 'Fuzzy'),
+    ]
+
 
 class JobFilter(FilterSet):
 
     """
     FilterSet for filtering job listings.
+
+    The text filters (keyword, location, company) are served by pg_trgm
+    GIN indexes. `match=contains` (the default) keeps substring semantics,
+    `match=fuzzy` matches words similar to the given text instead.
     """
 
-    keyword = CharFilter(field_name='title', lookup_expr='icontains')
+    keyword = CharFilter(field_name='title', method='filter_text')
     min_salary = NumberFilter(field_name='salary', lookup_expr='gte')
     max_salary = NumberFilter(field_name='salary', lookup_expr='lte')
     education = ChoiceFilter(choices=Job._meta.get_field('education').choices)
     experience = ChoiceFilter(choices=Job._meta.get_field('experience').choices)
     job_type = ChoiceFilter(choices=Job._meta.get_field('job_type').choices)
-    location = CharFilter(lookup_expr='icontains')
+    location = CharFilter(method='filter_text')
+    company = CharFilter(field_name='company__company_name', method='filter_text')
+    match = ChoiceFilter(choices=MatchMode.CHOICES, method='filter_match_mode')
 
 
     class Meta:
@@ -25,4 +43,14 @@ class JobFilter(FilterSet):
             'salary': ['gte', 'lte'],
             'location': ['icontains'],
         }
-        
\ No newline at end of file
+
+    def filter_match_mode(self, queryset, name, value):
+        # Only selects how the text filters match, see filter_text()
+        return queryset
+
+    def filter_text(self, queryset, name, value):
+        if self.form.cleaned_data.get('match') == MatchMode.FUZZY:
+            lookup = 'trigram_word_similar'
+        else:
+            lookup = 'trigram_contains'
+        return queryset.filter(**{f'{name}__{lookup}': value})
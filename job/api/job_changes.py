@@ -0,0 +1,90 @@
+"""
+Log of the jobs touched by each write, for the in-process job indexes.
+
+The search index, the recommendation matrix and the salary snapshot are
+kept per process. Every committed job write bumps the `job_changes`
+version and stores the primary keys it touched under the new version, so
+a process whose copy is at version v catches up by re-reading only the
+jobs logged for v+1..current instead of reloading the whole table.
+
+Unlike the `jobs` version, which guards the response caches and also
+moves on company writes, this version only moves when a job changes.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from utils.cache_versions import get_version, bump_version
+
+JOB_CHANGES_VERSION = 'job_changes'
+
+CHANGES_KEY_PREFIX = 'job_changes'
+
+# Seconds a version's changes are kept; copies further behind are reloaded
+CHANGES_TIMEOUT = 24 * 60 * 60
+
+# Versions read per catch-up, copies further behind are reloaded
+MAX_CATCH_UP = 1000
+
+
+def _changes_key(version):
+    return f"{CHANGES_KEY_PREFIX}:{version}"
+
+
+def get_job_changes_version():
+    return get_version(JOB_CHANGES_VERSION)
+
+
+def record_job_changes(pks):
+    """
+    Log the jobs `pks` as changed once the current transaction commits,
+    so other processes never re-read them before the write is visible.
+    """
+
+    pks = [str(pk) for pk in pks]
+    if pks:
+        transaction.on_commit(lambda: _publish(pks))
+
+
+def _publish(pks):
+    version = bump_version(JOB_CHANGES_VERSION)
+    cache.set(_changes_key(version), pks, timeout=CHANGES_TIMEOUT)
+
+
+def catch_up(copy, apply):
+    """
+    Bring `copy`, an in-process copy of the jobs with `version` and
+    `stalled_at` attributes, up to date by passing the uuids of the jobs
+    changed since its version to `apply`. Returns False when the log
+    cannot do it (too far behind, counter reset, lost entries) and the
+    copy has to be reloaded from the database.
+    """
+
+    current = get_job_changes_version()
+    if current == copy.version:
+        return True
+    if copy.version is None or current < copy.version or current - copy.version > MAX_CATCH_UP:
+        return False
+
+    keys = [_changes_key(number) for number in range(copy.version + 1, current + 1)]
+    entries = cache.get_many(keys)
+    changed, reached = set(), copy.version
+    for number, key in enumerate(keys, copy.version + 1):
+        if key not in entries:
+            break
+        changed.update(uuid.UUID(pk) for pk in entries[key])
+        reached = number
+
+    if reached == copy.version:
+        # The next entry is being written by a writer that has just bumped
+        # the version, or it is lost if still missing at the next check
+        if copy.stalled_at == reached:
+            return False
+        copy.stalled_at = reached
+        return True
+    if changed:
+        apply(changed)
+    copy.version = reached
+    return True
@@ -0,0 +1,19 @@
+from django.db.models import CharField
+from django.db.models.lookups import PatternLookup
+
+
+@CharField.register_lookup
+class TrigramContains(PatternLookup):
+
+    """
+    Case-insensitive substring match written as a bare `col ILIKE '%x%'`.
+
+    Django's `icontains` compiles to `UPPER(col::text) LIKE UPPER(...)`,
+    which a GIN `gin_trgm_ops` index on the column cannot serve; ILIKE
+    against the plain column can.
+    """
+
+    lookup_name = 'trigram_contains'
+
+    def get_rhs_op(self, connection, rhs):
+        return 'ILIKE %s' % rhs
@@ -0,0 +1,370 @@
+"""
+Candidate-to-job recommendations over a sparse TF-IDF matrix of the
+active jobs.
+
+Rows are L2-normalized TF-IDF vectors, so scoring a candidate is a single
+sparse matrix-vector product giving the cosine similarity with every job.
+The matrix is split into a large base part and a small delta part that
+receives incremental job updates; replaced and removed rows are masked
+out. Once the delta or the masked rows grow past `compact_threshold`, the
+delta is folded into the base and the masked rows are dropped.
+
+Writes of other processes are caught up from the job change log
+(job.api.job_changes), re-reading only the jobs they touched.
+"""
+
+import logging
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from scipy import sparse
+
+from ..models import Job, Education, Experience
+from .job_changes import get_job_changes_version, catch_up
+from .search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the to was were will with '
+    'we you your our us they their this these those'.split()
+)
+
+# Ordinal levels, so "job requirement <= candidate level" is a comparison
+EDUCATION_LEVELS = {value: level for level, value in enumerate(Education.values)}
+EXPERIENCE_LEVELS = {value: level for level, value in enumerate(Experience.values)}
+
+EDUCATION_KEYWORDS = (
+    (EDUCATION_LEVELS[Education.PHD], ('phd', 'doctorate', 'doctor')),
+    (EDUCATION_LEVELS[Education.MASTER], ('master', 'masters', 'mtech', 'msc', 'mca', 'mba', 'm.e', 'm.a')),
+    (EDUCATION_LEVELS[Education.BACHELORS], ('bachelor', 'bachelors', 'btech', 'bsc', 'bca', 'b.e', 'b.a', 'degree')),
+    (EDUCATION_LEVELS[Education.HIGHER_SECONDARY], ('higher', 'secondary', '12th', 'plus', 'hsc')),
+)
+
+# Two-letter degrees only count written with dots ('M.E.', 'B.A'): bare
+# 'me', 'be', 'ma' and 'ba' are ordinary words
+DOTTED_DEGREE_RE = re.compile(r'\b([mb])\.\s?([ae])\b', re.IGNORECASE)
+
+YEARS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)')
+
+
+def job_terms(title, description, it_industry, education, experience):
+    text = ' '.join(filter(None, [title, title, description, it_industry, education, experience]))
+    return Counter(token for token in tokenize(text) if token not in STOP_WORDS)
+
+
+def candidate_terms(candidate):
+    text = ' '.join(filter(None, [candidate.skills, candidate.skills, candidate.experience, candidate.education]))
+    return Counter(token for token in tokenize(text) if token not in STOP_WORDS)
+
+
+def candidate_education_level(text):
+    """
+    Best-effort mapping of free-text education to an Education level,
+    None when nothing is recognized.
+    """
+
+    text = text or ''
+    tokens = set(tokenize(text.replace('.', '')))
+    tokens.update(f'{degree}.{field}'.lower() for degree, field in DOTTED_DEGREE_RE.findall(text))
+    for level, keywords in EDUCATION_KEYWORDS:
+        if tokens.intersection(keywords):
+            return level
+    return None
+
+
+def candidate_experience_level(text):
+    """
+    Best-effort mapping of free-text experience ('2 years', 'fresher')
+    to an Experience level, None when nothing is recognized.
+    """
+
+    text = (text or '').lower()
+    if 'fresher' in text:
+        return EXPERIENCE_LEVELS[Experience.NO_EXPERIENCE]
+    match = YEARS_RE.search(text)
+    if not match:
+        return None
+    return min(int(float(match.group(1))), EXPERIENCE_LEVELS[Experience.THREE_YEARS_PLUS])
+
+
+class JobTfidfMatrix:
+
+    """
+    TF-IDF rows of the active jobs plus the structured attributes used to
+    filter them.
+    """
+
+    compact_threshold = 5000
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Job change log version the matrix is up to date with
+        self.version = None
+        self.stalled_at = None
+        self.last_checked = time.monotonic()
+
+        self.vocabulary = {}
+        self.document_frequency = array('q')
+        self.document_count = 0
+
+        self.base = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.delta_rows = []
+        self._delta = None
+
+        self.row_uuids = []
+        self.rows = {}
+        self.live = bytearray()
+        self.education = bytearray()
+        self.experience = bytearray()
+
+    def _column(self, term):
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = self.vocabulary[term] = len(self.vocabulary)
+            self.document_frequency.append(0)
+        return column
+
+    def _idf(self, columns):
+        frequencies = np.frombuffer(self.document_frequency, dtype=np.int64)[columns]
+        return np.log((1 + self.document_count) / (1 + frequencies)) + 1
+
+    def _vector(self, counts):
+        """
+        Normalized TF-IDF weights for `counts`, restricted to known terms.
+        """
+
+        known = [(self.vocabulary[term], count) for term, count in counts.items() if term in self.vocabulary]
+        if not known:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        columns = np.array([column for column, count in known], dtype=np.int64)
+        weights = (1 + np.log([count for column, count in known])) * self._idf(columns)
+        weights /= np.linalg.norm(weights)
+        return columns, weights.astype(np.float32)
+
+    @classmethod
+    def from_database(cls):
+        """
+        Build the matrix for all active jobs in two passes over compact
+        arrays: term counts first, then TF-IDF weights once every document
+        frequency is known.
+        """
+
+        matrix = cls()
+        matrix.version = get_job_changes_version()
+        indptr, indices, counts = array('q', [0]), array('q'), array('f')
+        fields = ['uuid', 'title', 'description', 'it_industry', 'education', 'experience']
+        rows = Job.objects.filter(is_active=True).order_by().values_list(*fields).iterator(chunk_size=2000)
+        for job_uuid, *values in rows:
+            terms = job_terms(*values)
+            for term, count in terms.items():
+                column = matrix._column(term)
+                matrix.document_frequency[column] += 1
+                indices.append(column)
+                counts.append(count)
+            indptr.append(len(indices))
+            matrix._add_row_attributes(job_uuid, values[3], values[4])
+        matrix.document_count = len(matrix.row_uuids)
+
+        indices = np.frombuffer(indices, dtype=np.int64)
+        indptr = np.frombuffer(indptr, dtype=np.int64)
+        data = (1 + np.log(np.frombuffer(counts, dtype=np.float32))) * matrix._idf(indices)
+        norms = np.sqrt(np.add.reduceat(data ** 2, indptr[:-1])) if len(data) else np.array([])
+        lengths = np.diff(indptr)
+        data /= np.repeat(np.where(norms > 0, norms, 1), lengths) if len(data) else 1
+        matrix.base = sparse.csr_matrix(
+            (data.astype(np.float32), indices, indptr),
+            shape=(len(matrix.row_uuids), len(matrix.vocabulary)),
+        )
+        return matrix
+
+    def _add_row_attributes(self, job_uuid, education, experience):
+        self.rows[job_uuid] = len(self.row_uuids)
+        self.row_uuids.append(job_uuid)
+        self.live.append(1)
+        self.education.append(EDUCATION_LEVELS.get(education, 0))
+        self.experience.append(EXPERIENCE_LEVELS.get(experience, 0))
+
+    def _row_columns(self, row):
+        if row < self.base.shape[0]:
+            return self.base.indices[self.base.indptr[row]:self.base.indptr[row + 1]]
+        return self.delta_rows[row - self.base.shape[0]][0]
+
+    def remove_job(self, job_uuid):
+        with self.lock:
+            row = self.rows.pop(job_uuid, None)
+            if row is None:
+                return
+            self.live[row] = 0
+            for column in self._row_columns(row):
+                self.document_frequency[column] -= 1
+            self.document_count -= 1
+            self._compact_if_needed()
+
+    def update_job(self, job):
+        with self.lock:
+            self.remove_job(job.uuid)
+            if not job.is_active or job.pk is None:
+                return
+
+            terms = job_terms(job.title, job.description, job.it_industry, job.education, job.experience)
+            for term in terms:
+                self.document_frequency[self._column(term)] += 1
+            self.document_count += 1
+
+            self.delta_rows.append(self._vector(terms))
+            self._delta = None
+            self._add_row_attributes(job.uuid, job.education, job.experience)
+            self._compact_if_needed()
+
+    def _delta_matrix(self):
+        if self._delta is None:
+            indptr = np.cumsum([0] + [len(columns) for columns, weights in self.delta_rows])
+            indices = np.concatenate([columns for columns, weights in self.delta_rows] or [np.array([], np.int64)])
+            data = np.concatenate([weights for columns, weights in self.delta_rows] or [np.array([], np.float32)])
+            self._delta = sparse.csr_matrix(
+                (data, indices, indptr), shape=(len(self.delta_rows), len(self.vocabulary)))
+        return self._delta
+
+    def _compact_if_needed(self):
+        masked = len(self.row_uuids) - self.document_count
+        if len(self.delta_rows) >= self.compact_threshold or masked >= max(self.compact_threshold, self.document_count):
+            self._compact()
+
+    def _compact(self):
+        # Fold the delta into the base and drop the masked rows
+        base = self.base.copy()
+        base.resize((base.shape[0], len(self.vocabulary)))
+        live = np.flatnonzero(np.frombuffer(self.live, dtype=np.uint8))
+        self.base = sparse.vstack([base, self._delta_matrix()], format='csr')[live]
+        self.delta_rows = []
+        self._delta = None
+        self.row_uuids = [self.row_uuids[row] for row in live]
+        self.rows = {job_uuid: row for row, job_uuid in enumerate(self.row_uuids)}
+        self.live = bytearray(b'\x01' * len(live))
+        self.education = bytearray(np.frombuffer(self.education, dtype=np.uint8)[live].tobytes())
+        self.experience = bytearray(np.frombuffer(self.experience, dtype=np.uint8)[live].tobytes())
+
+    def recommend(self, counts, education_level=None, experience_level=None, exclude=(), limit=50):
+        """
+        Return up to `limit` (uuid, score) pairs for the live jobs most
+        similar to the term `counts`, skipping jobs in `exclude` and jobs
+        asking for more education or experience than the candidate has.
+        """
+
+        with self.lock:
+            columns, weights = self._vector(counts)
+            if not len(columns):
+                return []
+
+            query = np.zeros(len(self.vocabulary), dtype=np.float32)
+            query[columns] = weights
+            scores = np.concatenate([
+                self.base @ query[:self.base.shape[1]],
+                self._delta_matrix() @ query,
+            ])
+
+            mask = np.frombuffer(self.live, dtype=np.uint8).astype(bool)
+            if education_level is not None:
+                mask &= np.frombuffer(self.education, dtype=np.uint8) <= education_level
+            if experience_level is not None:
+                mask &= np.frombuffer(self.experience, dtype=np.uint8) <= experience_level
+            for job_uuid in exclude:
+                row = self.rows.get(job_uuid)
+                if row is not None:
+                    mask[row] = False
+            scores = np.where(mask, scores, 0)
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+            candidates = candidates[np.argsort(scores[candidates])[::-1]]
+            return [(self.row_uuids[row], float(scores[row])) for row in candidates]
+
+
+# Process-wide matrix, see get_job_matrix()
+_matrix = None
+_matrix_lock = threading.Lock()
+_rebuilding = threading.Event()
+
+# Job fields the matrix rows are built from
+MATRIX_FIELDS = ['uuid', 'title', 'description', 'it_industry', 'education', 'experience', 'is_active']
+
+
+def get_job_matrix():
+    """
+    Return this process's matrix, building it on first use. Writes made by
+    other processes are caught up in the background (rebuilding only when
+    the job change log cannot) while the current matrix keeps serving.
+    """
+
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None:
+            _matrix = JobTfidfMatrix.from_database()
+        matrix = _matrix
+
+    now = time.monotonic()
+    if now - matrix.last_checked >= settings.RECOMMENDATIONS_REFRESH_INTERVAL:
+        matrix.last_checked = now
+        if matrix.version != get_job_changes_version() and not _rebuilding.is_set():
+            _rebuilding.set()
+            threading.Thread(target=_refresh_job_matrix, daemon=True).start()
+    return matrix
+
+
+def apply_job_changes(matrix, pks):
+    jobs = {job.uuid: job for job in Job.objects.filter(pk__in=pks).only(*MATRIX_FIELDS)}
+    for pk in pks:
+        job = jobs.get(pk)
+        if job is None:
+            matrix.remove_job(pk)
+        else:
+            matrix.update_job(job)
+
+
+def _refresh_job_matrix():
+    global _matrix
+    try:
+        matrix = _matrix
+        if catch_up(matrix, lambda pks: apply_job_changes(matrix, pks)):
+            return
+        matrix = JobTfidfMatrix.from_database()
+        with _matrix_lock:
+            _matrix = matrix
+    except Exception:
+        # The current matrix keeps serving, retried at the next check
+        logger.exception("Refreshing the job recommendation matrix failed")
+    finally:
+        _rebuilding.clear()
+        connection.close()
+
+
+def update_job_matrix(job):
+    if _matrix is None:
+        return
+    _matrix.update_job(job)
+
+
+def remove_from_job_matrix(job_uuid):
+    if _matrix is None:
+        return
+    _matrix.remove_job(job_uuid)
+
+
+def update_job_matrix_for(queryset):
+    """
+    Refresh the rows of every job in `queryset`, for writes that bypass
+    post_save.
+    """
+
+    if _matrix is None:
+        return
+    for job in queryset.only(*MATRIX_FIELDS):
+        _matrix.update_job(job)
@@ -0,0 +1,220 @@
+"""
+Salary statistics over an in-memory columnar snapshot of active jobs.
+
+The snapshot keeps one salary array plus one choice-code array per group
+field. Job signals patch single rows in place, and the statistics for
+every group are computed in one vectorized NumPy pass, memoized until the
+next change. Writes of other processes are caught up from the job change
+log (job.api.job_changes), re-reading only the jobs they touched.
+"""
+
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from ..models import Job, JobType, Experience, ITIndustry
+from .job_changes import get_job_changes_version, catch_up
+
+GROUP_FIELDS = {
+    'it_industry': ITIndustry,
+    'experience': Experience,
+    'job_type': JobType,
+}
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class SalarySnapshot:
+
+    """
+    Salaries and group codes of the active jobs, one row per job.
+    """
+
+    initial_capacity = 1024
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Job change log version the snapshot is up to date with
+        self.version = None
+        self.stalled_at = None
+        self.last_checked = time.monotonic()
+
+        self.codes_by_value = {
+            field: {value: code for code, value in enumerate(choices.values)}
+            for field, choices in GROUP_FIELDS.items()
+        }
+        self.rows = {}
+        self.free_rows = []
+        self.size = 0
+        self.salaries = np.zeros(self.initial_capacity, dtype=np.int64)
+        self.codes = {field: np.zeros(self.initial_capacity, dtype=np.int16) for field in GROUP_FIELDS}
+        self.live = np.zeros(self.initial_capacity, dtype=bool)
+        self._stats = None
+
+    @classmethod
+    def from_database(cls):
+        snapshot = cls()
+        snapshot.version = get_job_changes_version()
+        fields = ['uuid', 'salary', *GROUP_FIELDS]
+        rows = Job.objects.filter(is_active=True).order_by().values_list(*fields).iterator(chunk_size=5000)
+        for job_uuid, salary, *values in rows:
+            snapshot._set_row(job_uuid, salary, dict(zip(GROUP_FIELDS, values)))
+        return snapshot
+
+    def _grow(self):
+        capacity = len(self.salaries) * 2
+        self.salaries = np.resize(self.salaries, capacity)
+        self.codes = {field: np.resize(codes, capacity) for field, codes in self.codes.items()}
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self.live)] = self.live
+        self.live = live
+
+    def _set_row(self, job_uuid, salary, values):
+        row = self.rows.get(job_uuid)
+        if row is None:
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                if self.size == len(self.salaries):
+                    self._grow()
+                row = self.size
+                self.size += 1
+            self.rows[job_uuid] = row
+        self.salaries[row] = salary
+        for field, value in values.items():
+            # Values outside the choices are left out of that field's groups
+            self.codes[field][row] = self.codes_by_value[field].get(value, -1)
+        self.live[row] = True
+        self._stats = None
+
+    def update_job(self, job):
+        with self.lock:
+            if not job.is_active or job.pk is None:
+                self.remove_job(job.uuid)
+                return
+            values = {field: getattr(job, field) for field in GROUP_FIELDS}
+            self._set_row(job.uuid, job.salary, values)
+
+    def remove_job(self, job_uuid):
+        with self.lock:
+            row = self.rows.pop(job_uuid, None)
+            if row is None:
+                return
+            self.live[row] = False
+            self.free_rows.append(row)
+            self._stats = None
+
+    def get_stats(self):
+        with self.lock:
+            if self._stats is None:
+                live = self.live[:self.size]
+                salaries = self.salaries[:self.size][live]
+                overall = _summarize(salaries, np.zeros(len(salaries), dtype=np.int16), ['all'])
+                stats = {'overall': overall.get('all')}
+                for field, choices in GROUP_FIELDS.items():
+                    stats[field] = _summarize(salaries, self.codes[field][:self.size][live], choices.values)
+                self._stats = stats
+            return self._stats
+
+
+def _summarize(salaries, codes, labels):
+    """
+    min/avg/max and percentiles of `salaries` per group code, in one pass:
+    rows are sorted by (code, salary) so every group is a contiguous run
+    and each percentile is a linear interpolation between two positions.
+    """
+
+    known = codes >= 0
+    salaries, codes = salaries[known], codes[known].astype(np.int64)
+    if not len(salaries):
+        return {}
+
+    order = np.lexsort((salaries, codes))
+    salaries, codes = salaries[order], codes[order]
+
+    counts = np.bincount(codes, minlength=len(labels))
+    sums = np.bincount(codes, weights=salaries, minlength=len(labels))
+    present = np.flatnonzero(counts)
+    counts, sums = counts[present], sums[present]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ends = starts + counts - 1
+
+    columns = {
+        'count': counts,
+        'min': salaries[starts],
+        'avg': np.round(sums / counts, 2),
+        'max': salaries[ends],
+    }
+    for percentile in PERCENTILES:
+        position = starts + (counts - 1) * (percentile / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        columns[f'p{percentile}'] = np.round(
+            salaries[lower] + (salaries[upper] - salaries[lower]) * fraction, 2)
+
+    return {
+        labels[code]: {name: column[i].item() for name, column in columns.items()}
+        for i, code in enumerate(present)
+    }
+
+
+# Process-wide snapshot, see get_salary_snapshot()
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_salary_snapshot():
+    """
+    Return this process's snapshot, catching up with the jobs other
+    processes have written since it was taken (reloading it when the job
+    change log cannot).
+    """
+
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = SalarySnapshot.from_database()
+        else:
+            now = time.monotonic()
+            if now - _snapshot.last_checked >= settings.SALARY_STATS_REFRESH_INTERVAL:
+                _snapshot.last_checked = now
+                if not catch_up(_snapshot, apply_job_changes):
+                    _snapshot = SalarySnapshot.from_database()
+    return _snapshot
+
+
+def apply_job_changes(pks):
+    jobs = {job.uuid: job for job in Job.objects.filter(pk__in=pks).only('uuid', 'salary', 'is_active', *GROUP_FIELDS)}
+    for pk in pks:
+        job = jobs.get(pk)
+        if job is None:
+            _snapshot.remove_job(pk)
+        else:
+            _snapshot.update_job(job)
+
+
+def update_salary_snapshot(job):
+    if _snapshot is None:
+        return
+    _snapshot.update_job(job)
+
+
+def remove_from_salary_snapshot(job_uuid):
+    if _snapshot is None:
+        return
+    _snapshot.remove_job(job_uuid)
+
+
+def update_salary_snapshot_for(queryset):
+    """
+    Refresh the rows of every job in `queryset`, for writes that bypass
+    post_save.
+    """
+
+    if _snapshot is None:
+        return
+    for job in queryset.only('uuid', 'salary', 'is_active', *GROUP_FIELDS):
+        _snapshot.update_job(job)
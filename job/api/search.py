@@ -0,0 +1,133 @@
+"""
+Postgres full-text search for jobs.
+
+Each job keeps a weighted `tsvector` in `Job.search_vector` (title >
+company name > location > description and the choice fields), indexed
+with GIN, so a search is answered by an index lookup instead of a chain
+of `icontains` ORs over a join.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.conf import settings
+from django.db.models import Case, F, OuterRef, Subquery, When
+from rest_framework import filters
+
+from account.models import CompanyProfile
+
+SEARCH_CONFIG = 'english'
+
+# Fields that feed the search vector, used to skip needless refreshes
+SEARCH_SOURCE_FIELDS = {'title', 'description', 'location', 'job_type', 'education', 'it_industry', 'company'}
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def job_search_vector():
+    """
+    Expression computing the weighted search vector of a job row.
+
+    The company name is pulled in with a subquery because joined field
+    references are not allowed in UPDATE statements.
+    """
+
+    company_name = Subquery(
+        CompanyProfile.objects.filter(pk=OuterRef('company_id')).values('company_name')[:1]
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(company_name, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('description', 'job_type', 'education', 'it_industry', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(queryset):
+    """
+    Recompute the search vector for every job in `queryset` in one UPDATE.
+    """
+
+    return queryset.update(search_vector=job_search_vector())
+
+
+def build_search_query(terms):
+    """
+    Turn the search terms into a prefix-matching tsquery, so partially
+    typed words still match ('pyth dev' -> 'pyth:* & dev:*').
+
+    Returns None if no usable word is left after sanitizing.
+    """
+
+    words = []
+    for term in terms:
+        words.extend(word for word in _NON_WORD_RE.split(term) if word)
+    if not words:
+        return None
+    raw_query = ' & '.join(f"{word}:*" for word in words)
+    return SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+
+
+class JobSearchFilter(filters.SearchFilter):
+
+    """
+    Search backend that matches the `search` param against the indexed
+    job search vector and orders results by relevance.
+
+    With `JOB_SEARCH_BACKEND = 'memory'` the in-process BM25 index of
+    job.api.search_index is queried instead.
+    """
+
+    # JobFilter params the in-process index answers with its own bitsets
+    index_filter_params = ('job_type', 'education', 'experience')
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        if settings.JOB_SEARCH_BACKEND == 'memory':
+            return self.filter_queryset_from_index(request, queryset, terms)
+
+        query = build_search_query(terms)
+        if query is None:
+            return queryset.none()
+
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', '-created_at')
+
+    def filter_queryset_from_index(self, request, queryset, terms):
+        from .search_index import get_job_search_index
+
+        filters = {
+            param: request.query_params[param]
+            for param in self.index_filter_params
+            if request.query_params.get(param)
+        }
+        filters['is_active'] = True
+        hits = get_job_search_index().search(' '.join(terms), filters=filters, limit=None)
+        if not hits:
+            return queryset.none()
+
+        # The remaining JobFilter predicates are applied by the database:
+        # past JOB_SEARCH_MAX_RESULTS hits, page through the ranking until
+        # that many pass them, so selective filters do not lose matches
+        limit = settings.JOB_SEARCH_MAX_RESULTS
+        if len(hits) <= limit:
+            pks = [pk for pk, score in hits]
+        else:
+            pks = []
+            for start in range(0, len(hits), limit):
+                page = [pk for pk, score in hits[start:start + limit]]
+                matching = set(queryset.filter(pk__in=page).values_list('pk', flat=True))
+                pks.extend(pk for pk in page if pk in matching)
+                if len(pks) >= limit:
+                    break
+            pks = pks[:limit]
+        if not pks:
+            return queryset.none()
+
+        # Keep the index ranking
+        ranking = Case(*[When(pk=pk, then=position) for position, pk in enumerate(pks)])
+        return queryset.filter(pk__in=pks).order_by(ranking)
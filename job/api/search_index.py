@@ -0,0 +1,582 @@
+"""
+In-process inverted index over jobs, ranked with BM25.
+
+The index is made of an immutable base segment, read from a memory-mapped
+snapshot file, and a small in-memory delta segment that receives the
+incremental updates sent by the job signals. Updated or deleted jobs are
+tombstoned in the `live` bitset and the equality filters of JobFilter
+(job_type, education, experience) are answered by intersecting per-value
+bitsets with it before any posting is scored. Bitsets are bytearrays, so
+an update flips single bits instead of copying the whole set.
+
+Writes of other processes are caught up from the job change log
+(job.api.job_changes), re-reading only the jobs they touched. Once the
+delta grows past `compact_threshold` docs, the snapshot is rebuilt from
+the database and the delta starts over empty.
+
+Snapshot layout (native byte order):
+
+    MAGIC | header length (u64) | JSON header | padding | sections...
+
+The header holds the vocabulary, the facet value tables and the offset of
+every section: term offsets (u64), posting doc numbers (u32), posting
+weighted term frequencies (u32), doc UUIDs (16 bytes each), doc lengths
+(u32) and one u8 value code per doc and facet field.
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from collections import Counter
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from ..models import Job
+from .job_changes import get_job_changes_version, catch_up
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'JOBIDX01'
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Term frequency weights per field, a cheap stand-in for BM25F field boosts
+FIELD_WEIGHTS = (
+    ('title', 3),
+    ('company_name', 2),
+    ('location', 2),
+    ('description', 1),
+)
+
+FACET_FIELDS = ('job_type', 'education', 'experience', 'it_industry', 'is_active')
+
+DOCUMENT_FIELDS = ('uuid', 'title', 'description', 'location', 'company__company_name', *FACET_FIELDS)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def term_frequencies(document):
+    frequencies = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(document[field]):
+            frequencies[token] += weight
+    return frequencies
+
+
+def document_from_job(job):
+    document = {
+        'uuid': job.uuid,
+        'title': job.title,
+        'description': job.description,
+        'location': job.location,
+        'company_name': job.company.company_name,
+    }
+    for field in FACET_FIELDS:
+        document[field] = getattr(job, field)
+    return document
+
+
+def iter_job_documents(queryset=None):
+    """
+    Stream index documents for `queryset` (all jobs by default) with a
+    server-side cursor, joining the company name in the same query.
+    """
+
+    queryset = Job.objects.all() if queryset is None else queryset
+    rows = queryset.order_by().values_list(*DOCUMENT_FIELDS).iterator(chunk_size=2000)
+    for row in rows:
+        document = dict(zip(DOCUMENT_FIELDS, row))
+        document['company_name'] = document.pop('company__company_name')
+        yield document
+
+
+def _align(offset, size=8):
+    return (offset + size - 1) // size * size
+
+
+def _set_bit(bitmap, position):
+    index = position >> 3
+    if index >= len(bitmap):
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    bitmap[index] |= 1 << (position & 7)
+
+
+def write_snapshot(path, documents, version):
+    """
+    Build a compact index from `documents` and write it atomically to `path`.
+
+    Returns the number of documents written.
+    """
+
+    postings = {}
+    uuids = bytearray()
+    lengths = array('I')
+    facet_values = {field: [] for field in FACET_FIELDS}
+    facet_lookup = {field: {} for field in FACET_FIELDS}
+    facet_codes = {field: array('B') for field in FACET_FIELDS}
+
+    doc_count = 0
+    for docno, document in enumerate(documents):
+        doc_count += 1
+        uuids += document['uuid'].bytes
+        term_counts = term_frequencies(document)
+        lengths.append(sum(term_counts.values()))
+        for term, frequency in term_counts.items():
+            term_postings = postings.get(term)
+            if term_postings is None:
+                term_postings = postings[term] = (array('I'), array('I'))
+            term_postings[0].append(docno)
+            term_postings[1].append(frequency)
+        for field in FACET_FIELDS:
+            value = document[field]
+            code = facet_lookup[field].get(value)
+            if code is None:
+                code = facet_lookup[field][value] = len(facet_values[field])
+                facet_values[field].append(value)
+            facet_codes[field].append(code)
+
+    terms = sorted(postings)
+    offsets = array('Q', [0])
+    docs = array('I')
+    frequencies = array('I')
+    for term in terms:
+        term_docs, term_doc_frequencies = postings[term]
+        docs.extend(term_docs)
+        frequencies.extend(term_doc_frequencies)
+        offsets.append(len(docs))
+
+    sections = [
+        ('offsets', 'Q', offsets),
+        ('docs', 'I', docs),
+        ('frequencies', 'I', frequencies),
+        ('uuids', 'B', uuids),
+        ('lengths', 'I', lengths),
+    ]
+    sections += [(f'facet:{field}', 'B', facet_codes[field]) for field in FACET_FIELDS]
+
+    layout = {}
+    offset = 0
+    for name, typecode, data in sections:
+        nbytes = len(memoryview(data).cast('B'))
+        layout[name] = [offset, nbytes, typecode]
+        offset = _align(offset + nbytes)
+
+    header = json.dumps({
+        'version': version,
+        'doc_count': doc_count,
+        'terms': terms,
+        'facet_values': facet_values,
+        'sections': layout,
+    }).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for name, typecode, data in sections:
+                f.seek(data_start + layout[name][0])
+                f.write(memoryview(data).cast('B'))
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return doc_count
+
+
+class JobSearchIndex:
+
+    """
+    BM25 search over a memory-mapped base segment plus an in-memory delta.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    # Upper bound on the vocabulary terms a prefix expands to
+    max_expansions = 50
+    # Delta docs (new and replaced jobs) past which the snapshot is rebuilt
+    compact_threshold = 5000
+
+    def __init__(self, path=None):
+        self.lock = threading.RLock()
+        # Job change log version: the snapshot's, then the last caught up
+        self.version = None
+        self.snapshot_version = None
+        self.stalled_at = None
+        self.last_checked = time.monotonic()
+
+        self._mmap = None
+        self.terms = []
+        self.term_numbers = {}
+        self.offsets = array('Q', [0])
+        self.docs = array('I')
+        self.frequencies = array('I')
+        self.base_uuids = b''
+        self.base_count = 0
+
+        self.delta_uuids = []
+        self.delta_terms = []
+        self.delta_postings = {}
+        self.doc_lengths = array('I')
+        self.doc_numbers = None
+
+        self.facet_values = {field: [] for field in FACET_FIELDS}
+        self.facet_bits = {field: {} for field in FACET_FIELDS}
+        self.live = bytearray()
+        self.live_count = 0
+        self.total_length = 0
+
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a job search index snapshot.")
+
+        header_length = struct.unpack_from('<Q', self._mmap, len(MAGIC))[0]
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start = _align(header_start + header_length)
+        view = memoryview(self._mmap)
+
+        def section(name):
+            offset, nbytes, typecode = header['sections'][name]
+            return view[data_start + offset:data_start + offset + nbytes].cast(typecode)
+
+        self.version = self.snapshot_version = header['version']
+        self.terms = header['terms']
+        self.term_numbers = {term: number for number, term in enumerate(self.terms)}
+        self.offsets = section('offsets')
+        self.docs = section('docs')
+        self.frequencies = section('frequencies')
+        self.base_uuids = section('uuids')
+        self.base_count = header['doc_count']
+        self.doc_lengths = array('I', section('lengths'))
+        self.total_length = sum(self.doc_lengths)
+        self.live_count = self.base_count
+        byte_count = (self.base_count + 7) // 8
+        self.live = bytearray(((1 << self.base_count) - 1).to_bytes(byte_count, 'little'))
+
+        # Expand the per-doc facet codes into one bitset per facet value
+        for field in FACET_FIELDS:
+            values = header['facet_values'][field]
+            bitmaps = [bytearray(byte_count) for value in values]
+            for docno, code in enumerate(section(f'facet:{field}')):
+                bitmaps[code][docno >> 3] |= 1 << (docno & 7)
+            self.facet_values[field] = values
+            self.facet_bits[field] = dict(zip(values, bitmaps))
+
+    @property
+    def doc_count(self):
+        return self.base_count + len(self.delta_uuids)
+
+    @property
+    def needs_compaction(self):
+        return len(self.delta_uuids) >= max(self.compact_threshold, self.base_count // 4)
+
+    def doc_uuid(self, docno):
+        if docno < self.base_count:
+            return uuid.UUID(bytes=bytes(self.base_uuids[docno * 16:(docno + 1) * 16]))
+        return self.delta_uuids[docno - self.base_count]
+
+    def _doc_numbers(self):
+        # UUID -> live doc number, only built once the first update arrives
+        if self.doc_numbers is None:
+            live_bytes = self.live
+            self.doc_numbers = {
+                self.doc_uuid(docno): docno
+                for docno in range(self.doc_count)
+                if live_bytes[docno >> 3] >> (docno & 7) & 1
+            }
+        return self.doc_numbers
+
+    def remove_document(self, job_uuid):
+        with self.lock:
+            docno = self._doc_numbers().pop(job_uuid, None)
+            if docno is None:
+                return
+            self.live[docno >> 3] &= ~(1 << (docno & 7))
+            self.live_count -= 1
+            self.total_length -= self.doc_lengths[docno]
+
+    def add_document(self, document):
+        """
+        Index `document`, replacing any previous version of the same job.
+        """
+
+        with self.lock:
+            self.remove_document(document['uuid'])
+
+            docno = self.doc_count
+            self.delta_uuids.append(document['uuid'])
+            self._doc_numbers()[document['uuid']] = docno
+
+            frequencies = term_frequencies(document)
+            length = sum(frequencies.values())
+            self.doc_lengths.append(length)
+            for term, frequency in frequencies.items():
+                postings = self.delta_postings.get(term)
+                if postings is None:
+                    postings = self.delta_postings[term] = (array('I'), array('I'))
+                    bisect.insort(self.delta_terms, term)
+                postings[0].append(docno)
+                postings[1].append(frequency)
+
+            _set_bit(self.live, docno)
+            self.live_count += 1
+            self.total_length += length
+            for field in FACET_FIELDS:
+                _set_bit(self.facet_bits[field].setdefault(document[field], bytearray()), docno)
+
+    def _postings(self, term):
+        number = self.term_numbers.get(term)
+        if number is not None:
+            start, end = self.offsets[number], self.offsets[number + 1]
+            yield self.docs[start:end], self.frequencies[start:end]
+        if term in self.delta_postings:
+            yield self.delta_postings[term]
+
+    def _expand(self, prefix):
+        """
+        The vocabulary terms starting with `prefix`, exact match first.
+        """
+
+        expansions = set()
+        for terms in (self.terms, self.delta_terms):
+            position = bisect.bisect_left(terms, prefix)
+            while (position < len(terms) and terms[position].startswith(prefix)
+                   and len(expansions) < self.max_expansions):
+                expansions.add(terms[position])
+                position += 1
+        return sorted(expansions, key=lambda term: (term != prefix, term))
+
+    def search(self, query, filters=None, limit=100):
+        """
+        Return up to `limit` (uuid, score) pairs for the jobs matching every
+        word of `query` (as a prefix) and every `field=value` in `filters`,
+        best first. A None `limit` returns every match.
+        """
+
+        words = tokenize(query)
+        if not words:
+            return []
+
+        with self.lock:
+            if not self.live_count:
+                return []
+
+            mask = int.from_bytes(self.live, 'little')
+            for field, value in (filters or {}).items():
+                mask &= int.from_bytes(self.facet_bits[field].get(value, b''), 'little')
+            if not mask:
+                return []
+            mask_bytes = mask.to_bytes(len(self.live), 'little')
+
+            k1, b = self.k1, self.b
+            average_length = self.total_length / self.live_count
+            lengths = self.doc_lengths
+            scores = None
+            for word in words:
+                word_scores = {}
+                for term in self._expand(word):
+                    postings = list(self._postings(term))
+                    document_frequency = sum(len(docs) for docs, frequencies in postings)
+                    idf = math.log(1 + (self.live_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                    for docs, frequencies in postings:
+                        for docno, frequency in zip(docs, frequencies):
+                            if not mask_bytes[docno >> 3] >> (docno & 7) & 1:
+                                continue
+                            norm = k1 * (1 - b + b * lengths[docno] / average_length)
+                            word_scores[docno] = (
+                                word_scores.get(docno, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+                            )
+
+                # Every word has to match
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {docno: score + word_scores[docno] for docno, score in scores.items() if docno in word_scores}
+                if not scores:
+                    return []
+
+            if limit is None:
+                best = sorted(scores.items(), key=itemgetter(1), reverse=True)
+            else:
+                best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            return [(self.doc_uuid(docno), score) for docno, score in best]
+
+
+# Process-wide index, see get_job_search_index()
+_index = None
+_index_lock = threading.Lock()
+_refreshing = threading.Event()
+
+REBUILD_LOCK_KEY = 'job_search_index:rebuild'
+
+
+def search_index_enabled():
+    return settings.JOB_SEARCH_BACKEND == 'memory'
+
+
+def build_snapshot(path=None):
+    """
+    Rebuild the snapshot from the database. The version is read before the
+    rows, so writes racing with the build are caught up from the log.
+    """
+
+    path = path or settings.JOB_SEARCH_INDEX_PATH
+    version = get_job_changes_version()
+    return write_snapshot(path, iter_job_documents(), version)
+
+
+def read_snapshot_version(path):
+    # Version of the snapshot at `path` without loading it, None if missing
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            header_length = struct.unpack('<Q', f.read(8))[0]
+            return json.loads(f.read(header_length))['version']
+    except OSError:
+        return None
+
+
+def get_job_search_index():
+    """
+    Return this process's index, loading the snapshot on first use. The
+    database is only read when no snapshot exists yet.
+    """
+
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = settings.JOB_SEARCH_INDEX_PATH
+                if not os.path.exists(path):
+                    build_snapshot(path)
+                _index = JobSearchIndex(path)
+    _check_freshness(_index)
+    return _index
+
+
+def _check_freshness(index):
+    # Writes made by other processes only show up in the job change log
+    now = time.monotonic()
+    if now - index.last_checked < settings.JOB_SEARCH_INDEX_REFRESH_INTERVAL:
+        return
+    index.last_checked = now
+    if (index.needs_compaction or index.version != get_job_changes_version()) and not _refreshing.is_set():
+        _refreshing.set()
+        threading.Thread(target=refresh_job_search_index, daemon=True).start()
+
+
+def apply_job_changes(index, pks):
+    """
+    Re-index the jobs `pks` from the database, dropping the deleted ones.
+    """
+
+    documents = {document['uuid']: document for document in iter_job_documents(Job.objects.filter(pk__in=pks))}
+    for pk in pks:
+        document = documents.get(pk)
+        if document is None:
+            index.remove_document(pk)
+        else:
+            index.add_document(document)
+
+
+def refresh_job_search_index():
+    """
+    Catch the index up with the job change log, or swap in a new snapshot
+    when the log cannot (too far behind) or the delta needs compacting.
+    The snapshot is rebuilt by one process at a time; the others load it
+    once it is newer than theirs. The current index keeps serving in the
+    meantime.
+    """
+
+    global _index
+    try:
+        index = _index
+        if not index.needs_compaction and catch_up(index, lambda pks: apply_job_changes(index, pks)):
+            return
+
+        path = settings.JOB_SEARCH_INDEX_PATH
+        snapshot_version = read_snapshot_version(path)
+        if snapshot_version is None or snapshot_version <= index.snapshot_version:
+            if not cache.add(REBUILD_LOCK_KEY, 1, timeout=settings.JOB_SEARCH_INDEX_REFRESH_INTERVAL * 10):
+                # Another process is rebuilding it, loaded at a later check
+                return
+            try:
+                build_snapshot(path)
+            finally:
+                cache.delete(REBUILD_LOCK_KEY)
+        new_index = JobSearchIndex(path)
+        # Writes logged since the snapshot's version
+        catch_up(new_index, lambda pks: apply_job_changes(new_index, pks))
+        with _index_lock:
+            _index = new_index
+    except Exception:
+        # The current index keeps serving, retried at the next check
+        logger.exception("Refreshing the job search index failed")
+    finally:
+        _refreshing.clear()
+        connection.close()
+
+
+def index_job(job):
+    """
+    Apply a job write to this process's index, if it has been loaded.
+    Other processes pick it up from the job change log.
+    """
+
+    if _index is None or not search_index_enabled():
+        return
+    if job.pk is None:
+        # Deleted while being saved (expired jobs)
+        return
+    _index.add_document(document_from_job(job))
+
+
+def unindex_job(job_uuid):
+    if _index is None or not search_index_enabled():
+        return
+    _index.remove_document(job_uuid)
+
+
+def index_jobs(queryset):
+    """
+    Re-index every job in `queryset`, for writes that bypass post_save.
+    """
+
+    if _index is None or not search_index_enabled():
+        return
+    for document in iter_job_documents(queryset):
+        _index.add_document(document)
+
+
+def index_company_jobs(company):
+    # A company rename changes every one of its jobs' documents
+    index_jobs(Job.objects.filter(company=company))
@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from ..models import Job
+from .expiry import is_job_live, archive_job_applications
+from utils.fast_read import Projection, to_datetime
 
 class JobSerializer(serializers.ModelSerializer):
 
@@ -15,9 +19,107 @@ class JobSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         title = data.get('title')
-        company = data.get('company')
+        company = data.get('company') or self.context.get('company_profile')
         if company:
-            existing_job = Job.objects.filter(company=company, title=title).first()
-            if existing_job:
+            existing_jobs = Job.objects.filter(company=company, title=title)
+            if self.instance is not None:
+                existing_jobs = existing_jobs.exclude(pk=self.instance.pk)
+            if existing_jobs.exists():
                 raise serializers.ValidationError("A job with this title already exists for your company.")
-        return data
\ No newline at end of file
+        return data
+
+    def update(self, instance, validated_data):
+        # Only the sent fields are written: a full save would write back
+        # the `views` read before a concurrent flush of job.api.view_counts
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        update_fields = [*validated_data, 'updated_at']
+        was_active = instance.is_active
+        if 'last_date' in validated_data:
+            # A new last date revives an expired job, or expires it now
+            instance.is_active = is_job_live(instance.last_date)
+            update_fields.append('is_active')
+        with transaction.atomic():
+            instance.save(update_fields=update_fields)
+            if instance.is_active != was_active:
+                archive_job_applications([instance.pk], archived=not instance.is_active)
+        return instance
+
+
+# JobSerializer's output for the fast read path, with the keyset
+# pagination ordering fields fetched alongside
+JOB_PROJECTION = Projection([
+    ('title', 'title'),
+    ('description', 'description'),
+    ('location', 'location'),
+    ('job_type', 'job_type'),
+    ('education', 'education'),
+    ('it_industry', 'it_industry'),
+    ('experience', 'experience'),
+    ('salary', 'salary'),
+    ('positions', 'positions'),
+    ('last_date', 'last_date', to_datetime),
+], extra=('created_at', 'uuid'))
+
+
+class RecommendedJobSerializer(JobSerializer):
+
+    """
+    Job serializer for recommendations, with the job id to apply with and
+    the similarity score.
+    """
+
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = ['uuid', *JobSerializer.Meta.fields, 'score']
+
+
+class CompanyJobSerializer(JobSerializer):
+
+    """
+    Job serializer for the company dashboard, with the view count and the
+    application counts annotated by CreateJob.get.
+    """
+
+    total_applications = serializers.IntegerField(read_only=True)
+    pending_applications = serializers.IntegerField(read_only=True)
+    accepted_applications = serializers.IntegerField(read_only=True)
+    declined_applications = serializers.IntegerField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = [
+            'uuid', *JobSerializer.Meta.fields, 'is_active', 'created_at', 'views',
+            'total_applications', 'pending_applications', 'accepted_applications', 'declined_applications',
+        ]
+
+
+class BulkJobItemSerializer(JobSerializer):
+
+    """
+    One job of a bulk post. Title collisions are checked for the whole
+    batch at once by BulkJobSerializer's caller, not per item.
+    """
+
+    def validate(self, data):
+        return data
+
+
+class BulkJobSerializer(serializers.Serializer):
+
+    """
+    Payload of a bulk job post: the jobs, and whether jobs whose title
+    the company already uses are updated (upsert) or reported as conflicts.
+    """
+
+    jobs = BulkJobItemSerializer(many=True, allow_empty=False, max_length=settings.JOB_BULK_MAX_ITEMS)
+    upsert = serializers.BooleanField(default=False)
+
+    def validate_jobs(self, jobs):
+        seen = set()
+        for job in jobs:
+            if job.get('title') in seen:
+                raise serializers.ValidationError(f"Duplicate title in payload: {job.get('title')}.")
+            seen.add(job.get('title'))
+        return jobs
+
@@ -1,11 +1,114 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
 
 from ..models import Job
+from account.models import CompanyProfile
+from .cache import bump_jobs_version
+from .job_changes import record_job_changes
+from .search import SEARCH_SOURCE_FIELDS, update_search_vector
+from .search_index import index_job, unindex_job, index_company_jobs, index_jobs
+from .salary_stats import update_salary_snapshot, remove_from_salary_snapshot, update_salary_snapshot_for
+from .recommendations import update_job_matrix, remove_from_job_matrix, update_job_matrix_for
+from .static_feed import schedule_static_feed_rebuild
+
+# Sent after queryset-level writes (update(), bulk_create()) that bypass
+# post_save, with the primary keys of the affected jobs and, like
+# post_save, the names of the updated fields (None for all of them)
+jobs_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Job)
+def refresh_job_search_vector(sender, instance, update_fields=None, **kwargs):
+    # Saves that only touch non-searchable fields keep the current vector
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    update_search_vector(Job.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_listing_cache(sender, instance, **kwargs):
+    # Any write to a job makes every cached listing page stale
+    bump_jobs_version()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def log_job_change(sender, instance, **kwargs):
+    # Caught up by the in-process indexes of the other processes
+    if instance.pk is not None:
+        record_job_changes([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_index(sender, instance, **kwargs):
+    index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    unindex_job(instance.uuid)
+
+
+@receiver(post_save, sender=Job)
+def update_salary_stats(sender, instance, **kwargs):
+    update_salary_snapshot(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_salary_stats(sender, instance, **kwargs):
+    remove_from_salary_snapshot(instance.uuid)
+
 
 @receiver(post_save, sender=Job)
-def delete_expired_job(sender, instance, **kwargs):
-    # Check if the job's last data has passed
-    if instance.last_date < timezone.now():
-        instance.delete()
+def update_recommendation_matrix(sender, instance, **kwargs):
+    update_job_matrix(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_recommendation_matrix(sender, instance, **kwargs):
+    remove_from_job_matrix(instance.uuid)
+
+
+@receiver(jobs_bulk_changed)
+def refresh_bulk_changed_jobs(sender, pks, update_fields=None, **kwargs):
+    if update_fields is None or SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        update_search_vector(Job.objects.filter(pk__in=pks))
+    bump_jobs_version()
+    record_job_changes(pks)
+    index_jobs(Job.objects.filter(pk__in=pks))
+    update_salary_snapshot_for(Job.objects.filter(pk__in=pks))
+    update_job_matrix_for(Job.objects.filter(pk__in=pks))
+    schedule_static_feed_rebuild()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_delete, sender=CompanyProfile)
+def rebuild_static_feed(sender, instance, **kwargs):
+    schedule_static_feed_rebuild()
+
+
+@receiver(post_save, sender=CompanyProfile)
+def refresh_company_jobs_search_vector(sender, instance, created, **kwargs):
+    # The company name is part of every one of its jobs' search vector
+    if not created:
+        update_search_vector(Job.objects.filter(company=instance))
+
+
+@receiver(post_save, sender=CompanyProfile)
+@receiver(post_delete, sender=CompanyProfile)
+def invalidate_job_listing_cache_for_company(sender, instance, **kwargs):
+    # Job search matches on the company name as well
+    bump_jobs_version()
+
+
+@receiver(post_save, sender=CompanyProfile)
+def update_company_jobs_in_search_index(sender, instance, created, **kwargs):
+    # Only a rename changes the jobs' search documents
+    renamed = not created and instance.company_name != getattr(instance, '_loaded_company_name', None)
+    instance._loaded_company_name = instance.company_name
+    if renamed:
+        index_company_jobs(instance)
+        record_job_changes(Job.objects.filter(company=instance).values_list('pk', flat=True))
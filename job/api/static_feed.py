@@ -0,0 +1,179 @@
+"""
+Pre-rendered snapshot of the public job feed.
+
+The first STATIC_FEED_PAGES pages of the job listing (default ordering)
+and the public company list are rendered through their views and written
+as JSON plus gzipped JSON under STATIC_FEED_ROOT/current/, so a front
+proxy can serve them directly:
+
+    current/jobs/page-<n>.json[.gz]    GET /api/jobs/?page=<n>
+    current/companies.json[.gz]        GET /api/account/public/companies/
+    current/manifest.json
+
+Every build goes to a fresh directory and `current` is a symlink swapped
+with a rename, so readers never see a half-written snapshot. Job and
+company writes schedule a debounced rebuild in a background thread.
+"""
+
+import gzip
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from .cache import get_jobs_version
+from .pagination import CustomPagination
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = '/api/jobs/'
+COMPANIES_PATH = '/api/account/public/companies/'
+
+REBUILD_LOCK_KEY = 'static_feed:rebuild'
+
+
+def render_view(view, path, params=None):
+    """
+    Render `view` for an anonymous GET of `path` on STATIC_FEED_BASE_URL,
+    returning the status code and the response body.
+    """
+
+    base_url = urlsplit(settings.STATIC_FEED_BASE_URL)
+    request = RequestFactory().get(
+        path, params or {},
+        HTTP_HOST=base_url.netloc, HTTP_ACCEPT='application/json', secure=base_url.scheme == 'https',
+    )
+    response = view(request)
+    response.render()
+    return response.status_code, response.content
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    # mtime=0 keeps the gzip output identical for identical content
+    path.with_name(path.name + '.gz').write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+
+
+def build_static_feed(root=None, pages=None):
+    """
+    Render and publish a new snapshot. Returns the number of job pages
+    written.
+    """
+
+    from .views import AllJob
+    from account.api.views import CompanyProfilePublicListView
+
+    root = Path(root or settings.STATIC_FEED_ROOT)
+    pages = pages or settings.STATIC_FEED_PAGES
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Read before rendering, so a write racing the build leaves the
+    # snapshot marked as older than it
+    version = get_jobs_version()
+    build_dir = Path(tempfile.mkdtemp(prefix='feed-', dir=root))
+    try:
+        jobs_view = AllJob.as_view()
+        page_count = pages
+        page = 1
+        while page <= page_count:
+            status_code, content = render_view(jobs_view, JOBS_PATH, {'page': page} if page > 1 else None)
+            if status_code != 200:
+                break
+            if page == 1:
+                # Never more pages than the listing has, but always page 1
+                total = orjson.loads(content)['count']
+                page_count = max(1, min(pages, math.ceil(total / CustomPagination.page_size)))
+            _write(build_dir / 'jobs' / f'page-{page}.json', content)
+            page += 1
+        written_pages = page - 1
+
+        status_code, content = render_view(CompanyProfilePublicListView.as_view(), COMPANIES_PATH)
+        if status_code == 200:
+            _write(build_dir / 'companies.json', content)
+
+        manifest = {'jobs_version': version, 'pages': written_pages, 'generated_at': timezone.now()}
+        (build_dir / 'manifest.json').write_bytes(orjson.dumps(manifest, option=orjson.OPT_UTC_Z))
+        os.chmod(build_dir, 0o755)
+
+        # Atomic switch: a new symlink renamed over `current`
+        link = root / f'current.{os.getpid()}.tmp'
+        if link.is_symlink():
+            link.unlink()
+        link.symlink_to(build_dir.name)
+        os.replace(link, root / 'current')
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    # Keep the previous build around for readers still streaming from it
+    builds = sorted(root.glob('feed-*'), key=lambda path: path.stat().st_mtime)
+    for old_build in builds[:-2]:
+        if old_build != build_dir:
+            shutil.rmtree(old_build, ignore_errors=True)
+    return written_pages
+
+
+_pending = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def schedule_static_feed_rebuild():
+    """
+    Rebuild the snapshot shortly after the current transaction commits.
+    Writes arriving while a rebuild is pending are folded into it.
+    """
+
+    if settings.STATIC_FEED_ENABLED:
+        transaction.on_commit(_request_rebuild)
+
+
+def _request_rebuild():
+    global _worker
+    with _worker_lock:
+        _pending.set()
+        if _worker is None:
+            _worker = threading.Thread(target=_rebuild_worker, daemon=True)
+            _worker.start()
+
+
+def _rebuild_worker():
+    global _worker
+    try:
+        while True:
+            time.sleep(settings.STATIC_FEED_DEBOUNCE)
+            _pending.clear()
+            # One builder at a time across processes; retry later otherwise
+            if cache.add(REBUILD_LOCK_KEY, 1, timeout=300):
+                try:
+                    build_static_feed()
+                except Exception:
+                    # The previous snapshot keeps being served
+                    logger.exception("Rebuilding the static job feed failed")
+                finally:
+                    cache.delete(REBUILD_LOCK_KEY)
+            else:
+                _pending.set()
+
+            with _worker_lock:
+                if not _pending.is_set():
+                    _worker = None
+                    return
+    finally:
+        with _worker_lock:
+            if _worker is threading.current_thread():
+                _worker = None
+        connection.close()
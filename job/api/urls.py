@@ -1,10 +1,15 @@
 from django.urls import path
-from .views import CreateJob,JobRetrieveUpdateDestroy ,AllJob
+from .views import CreateJob, BulkCreateJobs,JobRetrieveUpdateDestroy ,AllJob, JobFacets, SalaryInsights, RecommendedJobs, JobExport
 
 urlpatterns = [
     path('jobs/new/', CreateJob.as_view(), name= 'job-list-create'),
+    path('jobs/bulk/', BulkCreateJobs.as_view(), name='job-bulk-create'),
     path('jobs/<uuid:uuid>/', JobRetrieveUpdateDestroy.as_view(), name='job-CRUD'),
     path('jobs/', AllJob.as_view(), name='all-job'),
+    path('jobs/export/', JobExport.as_view(), name='job-export'),
+    path('jobs/facets/', JobFacets.as_view(), name='job-facets'),
+    path('jobs/salary-insights/', SalaryInsights.as_view(), name='job-salary-insights'),
+    path('jobs/recommended/', RecommendedJobs.as_view(), name='job-recommended'),
 
 
 ]
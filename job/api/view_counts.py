@@ -0,0 +1,146 @@
+"""
+Buffered job view counters.
+
+A job read increments a field of one Redis hash (HINCRBY) instead of
+updating the job row, so hot jobs do not serialize writes on their row.
+The flusher periodically moves the accumulated deltas to `Job.views` with
+one batched `UPDATE ... FROM (VALUES ...)`.
+
+When Redis is unavailable the deltas are buffered in process memory and
+flushed by a background thread of that process.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError, ResponseError
+
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTS_KEY = 'job_views'
+
+# (uuid, count) pairs per UPDATE statement
+FLUSH_BATCH_SIZE = 1000
+
+_buffer = Counter()
+_buffer_lock = threading.Lock()
+_flusher_started = threading.Event()
+
+
+def _redis():
+    # NotImplementedError when the cache backend is not django-redis
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def record_job_view(job_uuid):
+    client = _redis()
+    if client is not None:
+        try:
+            client.hincrby(VIEW_COUNTS_KEY, str(job_uuid), 1)
+            return
+        except RedisError:
+            pass
+
+    with _buffer_lock:
+        _buffer[str(job_uuid)] += 1
+    if not _flusher_started.is_set():
+        _flusher_started.set()
+        threading.Thread(target=_flush_buffer_forever, daemon=True).start()
+
+
+def write_view_deltas(deltas):
+    """
+    Add `deltas` ({job uuid: count}) to Job.views, FLUSH_BATCH_SIZE jobs
+    per UPDATE statement. Deltas of deleted jobs are dropped.
+    """
+
+    table = connection.ops.quote_name(Job._meta.db_table)
+    items = list(deltas.items())
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                batch = items[start:start + FLUSH_BATCH_SIZE]
+                values = ', '.join(['(%s::uuid, %s::integer)'] * len(batch))
+                params = [value for item in batch for value in item]
+                cursor.execute(
+                    f"UPDATE {table} AS job SET views = job.views + delta.count "
+                    f"FROM (VALUES {values}) AS delta (uuid, count) "
+                    f"WHERE job.uuid = delta.uuid",
+                    params,
+                )
+    return len(items)
+
+
+def flush_redis_views():
+    """
+    Move the Redis deltas to the database. Returns the number of jobs
+    updated.
+
+    The hash is renamed away first, so views recorded during the flush go
+    to a fresh hash; if the database write fails the deltas are added back.
+    """
+
+    client = _redis()
+    if client is None:
+        return 0
+
+    flushing_key = f"{VIEW_COUNTS_KEY}:flushing:{uuid.uuid4().hex}"
+    try:
+        client.rename(VIEW_COUNTS_KEY, flushing_key)
+    except ResponseError:
+        # No such key: nothing was viewed since the last flush
+        return 0
+    deltas = {key.decode(): int(count) for key, count in client.hgetall(flushing_key).items()}
+    try:
+        updated = write_view_deltas(deltas)
+    except Exception:
+        pipeline = client.pipeline()
+        for job_uuid, count in deltas.items():
+            pipeline.hincrby(VIEW_COUNTS_KEY, job_uuid, count)
+        pipeline.execute()
+        raise
+    finally:
+        client.delete(flushing_key)
+    return updated
+
+
+def flush_buffered_views():
+    """
+    Move this process's in-memory deltas to the database. Returns the
+    number of jobs updated.
+    """
+
+    global _buffer
+    with _buffer_lock:
+        deltas, _buffer = _buffer, Counter()
+    if not deltas:
+        return 0
+    try:
+        return write_view_deltas(deltas)
+    except Exception:
+        with _buffer_lock:
+            _buffer.update(deltas)
+        raise
+
+
+def _flush_buffer_forever():
+    while True:
+        time.sleep(settings.JOB_VIEWS_FLUSH_INTERVAL)
+        try:
+            flush_buffered_views()
+        except Exception:
+            # Kept in the buffer, retried on the next round
+            logger.exception("Flushing the buffered job views failed")
+        finally:
+            connection.close()
@@ -5,8 +5,11 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import ValidationError
-from django.db.models import Avg, Min, Max, Count
+from django.db import transaction, IntegrityError
+from django.db.models import Avg, Min, Max, Count, Q
 from django.utils.text import slugify
+from django.utils import timezone
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import PermissionDenied
@@ -14,13 +17,30 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, filters
 from django.core.cache import cache
 from django.conf import settings
+from rest_framework.settings import api_settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
-from .serializers import JobSerializer
+from .serializers import JobSerializer, RecommendedJobSerializer, BulkJobSerializer, CompanyJobSerializer, JOB_PROJECTION
 from ..models import Job
 from account.models import CompanyProfile
 from account.models import User
 from .filters import JobFilter
-from .pagination import CustomPagination
+from .pagination import CustomPagination, KeysetPagination, CursorPaginationMixin
+from .cache import build_jobs_cache_key, JOBS_VERSION
+from .search import JobSearchFilter
+from .salary_stats import get_salary_snapshot
+from .export import iter_job_ndjson
+from .view_counts import record_job_view
+from .expiry import is_job_live, archive_job_applications
+from utils.conditional import version_condition
+from utils.fast_read import FastReadMixin
+from .signals import jobs_bulk_changed
+from .recommendations import (
+    get_job_matrix, candidate_terms, candidate_education_level, candidate_experience_level,
+)
+from account.api.permissions import IsCandidateUser
+from application.models import Application
 
 
 class CreateJob(APIView):
@@ -30,7 +50,9 @@ class CreateJob(APIView):
 
     Allows authenticated company users to create and retrieve jobs posted by their company.
 
-    GET: Retrieve all jobs posted by the authenticated company user.
+    GET: Retrieve the jobs posted by the authenticated company user, paginated,
+    with their view count and total/pending/accepted/declined application
+    counts. Sort with `ordering`, e.g. `?ordering=-pending_applications`.
     POST: Create a new job post for the authenticated company user.
 
     Requires authentication and company user role.
@@ -39,6 +61,12 @@ class CreateJob(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
+    ordering_fields = [
+        'created_at', 'last_date', 'title', 'views',
+        'total_applications', 'pending_applications', 'accepted_applications', 'declined_applications',
+    ]
+    ordering = ['-created_at']
+
 
     def get(self, request):
         # company users can only access this endpoint
@@ -46,9 +74,21 @@ class CreateJob(APIView):
             raise PermissionDenied(
                 "Only company users are allowed to access this endpoint.")
 
-        jobs = Job.objects.filter(company=self.get_company_profile())
-        serializer = JobSerializer(jobs, many=True)
-        return Response(serializer.data)
+        # All four counts come from one LEFT JOIN + GROUP BY with the page
+        jobs = Job.objects.filter(company=self.get_company_profile()).defer('search_vector').annotate(
+            total_applications=Count('applications'),
+            pending_applications=Count('applications', filter=Q(applications__status='Pending')),
+            accepted_applications=Count('applications', filter=Q(applications__status='Accepted')),
+            declined_applications=Count('applications', filter=Q(applications__status='Declined')),
+        )
+        jobs = filters.OrderingFilter().filter_queryset(request, jobs, self)
+        # uuid breaks ties so pages stay stable when sorting by a count
+        jobs = jobs.order_by(*jobs.query.order_by, '-uuid')
+
+        paginator = CustomPagination()
+        page = paginator.paginate_queryset(jobs, request, view=self)
+        serializer = CompanyJobSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 
@@ -60,7 +100,7 @@ class CreateJob(APIView):
             return Response({"error": "User does not have a company profile."}, status=status.HTTP_400_BAD_REQUEST)
 
 
-        serializer = JobSerializer(data=request.data)
+        serializer = JobSerializer(data=request.data, context={'company_profile': company_profile})
         if serializer.is_valid():
             serializer.validated_data['company'] = company_profile
             serializer.save()
@@ -73,11 +113,127 @@ class CreateJob(APIView):
         return getattr(self.request.user, 'company_profile', None)
 
 
+class BulkCreateJobs(APIView):
+
+    """
+    API view for posting many jobs at once.
+
+    POST: {"jobs": [...], "upsert": false}. The whole payload is validated
+    first, title collisions with the company's existing jobs are checked
+    in one query, and the new jobs are inserted with a single bulk_create
+    in one transaction. With "upsert" true, colliding titles are updated
+    in place instead of being reported as conflicts; only the fields an
+    item sends are updated (one bulk_create per set of sent fields). A sent
+    last_date also sets is_active, reviving expired jobs (job.api.expiry).
+
+    Returns one result per item, in payload order.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request):
+        if request.user.role != User.COMPANY:
+            raise PermissionDenied(
+                "Only company users are allowed to access this endpoint.")
+
+        company_profile = getattr(request.user, 'company_profile', None)
+        if not company_profile:
+            return Response({"error": "User does not have a company profile."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = BulkJobSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['jobs']
+        upsert = serializer.validated_data['upsert']
+
+        existing = dict(
+            Job.objects.filter(company=company_profile, title__in=[item.get('title') for item in items])
+            .values_list('title', 'uuid')
+        )
+
+        now = timezone.now()
+        results, jobs, fields, activity = [], [], [], {True: [], False: []}
+        for item in items:
+            title = item.get('title')
+            if title in existing and not upsert:
+                results.append({'title': title, 'uuid': existing[title], 'status': 'conflict',
+                                'error': "A job with this title already exists for your company."})
+                continue
+            job = Job(company=company_profile, **item)
+            job_fields = set(item).difference(['title'])
+            if 'last_date' in item:
+                # A new last date revives an expired job, or expires it now
+                job.is_active = is_job_live(job.last_date, now)
+                job_fields.add('is_active')
+                if title in existing:
+                    activity[job.is_active].append(existing[title])
+            jobs.append(job)
+            fields.append(frozenset(job_fields))
+            results.append({'title': title, 'uuid': existing.get(title, job.uuid),
+                            'status': 'updated' if title in existing else 'created'})
+
+        if jobs:
+            try:
+                with transaction.atomic():
+                    if upsert:
+                        # Fields an item leaves out keep their current value
+                        # instead of being reset to the model defaults
+                        groups = {}
+                        for job, job_fields in zip(jobs, fields):
+                            groups.setdefault(job_fields, []).append(job)
+                        for job_fields, group in groups.items():
+                            Job.objects.bulk_create(
+                                group, update_conflicts=True, unique_fields=['company', 'title'],
+                                update_fields=[*sorted(job_fields), 'updated_at'],
+                            )
+                    else:
+                        Job.objects.bulk_create(jobs)
+                    for is_active, pks in activity.items():
+                        if pks:
+                            archive_job_applications(pks, archived=not is_active)
+            except IntegrityError:
+                # A concurrent post took one of the titles after the collision check
+                return Response({"error": "Some titles were posted concurrently, please retry."},
+                                status=status.HTTP_409_CONFLICT)
+
+            pks = [result['uuid'] for result in results if result['status'] != 'conflict']
+            transaction.on_commit(lambda: jobs_bulk_changed.send(sender=Job, pks=pks, update_fields=None))
+
+        return Response(
+            {'results': results},
+            status=status.HTTP_201_CREATED if jobs else status.HTTP_409_CONFLICT,
+        )
+
+
+
+def get_visible_jobs(user):
+    # Expired jobs are only shown to the company that posted them
+    return Job.objects.filter(Q(is_active=True) | Q(company__user=user))
+
+
+def job_updated_at(request, uuid):
+    # Memoized on the request, condition() asks for the ETag and the
+    # Last-Modified date separately
+    if not hasattr(request, '_job_updated_at'):
+        request._job_updated_at = (
+            get_visible_jobs(request.user).filter(uuid=uuid).values_list('updated_at', flat=True).first()
+        )
+    return request._job_updated_at
+
+
+def job_etag(request, uuid):
+    updated_at = job_updated_at(request, uuid)
+    if updated_at is None:
+        return None
+    return f"{uuid}-{int(updated_at.timestamp() * 1000000)}"
+
+
 # For Retriving , updating , deleting  a particular job
 class JobRetrieveUpdateDestroy(APIView):
 
     """
     API view for retrieving, updating, and deleting a specific job post.
+    Expired jobs are only retrieved by the company that posted them.
     """
 
     permission_classes = [IsAuthenticated]
@@ -88,7 +244,15 @@ class JobRetrieveUpdateDestroy(APIView):
 
 
     def get(self, request, uuid):
-        job = self.get_object(uuid)
+        # Counted before the conditional check: a 304 to a repeat visit is
+        # a view too. job_updated_at is memoized, so this costs no query
+        if job_updated_at(request, uuid) is not None:
+            record_job_view(uuid)
+        return self.get_job(request, uuid)
+
+    @method_decorator(condition(etag_func=job_etag, last_modified_func=job_updated_at))
+    def get_job(self, request, uuid):
+        job = get_object_or_404(get_visible_jobs(request.user), uuid=uuid)
         serializer = JobSerializer(job)
         return Response(serializer.data)
 
@@ -125,24 +289,199 @@ class JobRetrieveUpdateDestroy(APIView):
 
 
 
-class AllJob(generics.ListAPIView):
+@method_decorator(version_condition(JOBS_VERSION), name='get')
+class AllJob(FastReadMixin, CursorPaginationMixin, generics.ListAPIView):
 
     """
     API view for retrieving all jobs.
     Allows all users to retrieve a list of all job posts.
     Requires authentication.
     Supports search and filtering by various fields.
+    Pass `pagination=cursor` for keyset pagination (newest first; search
+    results are then ordered by date instead of relevance).
+    Conditional GETs are answered with 304 until the jobs version changes.
+    Rows are served through the fast read path (see utils.fast_read).
     """
 
     serializer_class = JobSerializer
+    projection = JOB_PROJECTION
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, JobSearchFilter]
+    filterset_class = JobFilter
+
+    # Response headers stored alongside the cached page data
+    cached_headers = [KeysetPagination.approximate_count_header]
+
+    def get_queryset(self):
+        return Job.objects.filter(is_active=True).defer('search_vector').order_by('-created_at', '-uuid')
+
+    def get_cache_key(self):
+        """
+        Cache key for this request, built from the normalized filter,
+        search and pagination params and the current jobs version.
+        """
+
+        param_names = [
+            *self.filterset_class.base_filters,
+            api_settings.SEARCH_PARAM,
+            self.pagination_query_param,
+            CustomPagination.page_query_param,
+            CustomPagination.page_size_query_param,
+            KeysetPagination.cursor_query_param,
+            KeysetPagination.approximate_count_query_param,
+        ]
+        defaults = {
+            CustomPagination.page_query_param: '1',
+            CustomPagination.page_size_query_param: str(CustomPagination.page_size),
+        }
+        return build_jobs_cache_key('all', self.request, param_names, defaults)
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self.get_cache_key()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            data, headers = cached
+            return Response(data, headers=headers)
+
+        response = super().list(request, *args, **kwargs)
+        headers = {name: response[name] for name in self.cached_headers if name in response}
+        cache.set(cache_key, (response.data, headers), timeout=settings.CACHE_TTL)
+        return response
+
+
+
+class JobExport(generics.GenericAPIView):
+
+    """
+    API view for exporting the active jobs as NDJSON.
+
+    Accepts the same filter and search params as AllJob and streams every
+    matching job, one JSON object per line, read through a server-side
+    cursor so memory use stays flat however many jobs match.
+    Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+    filter_backends = [DjangoFilterBackend, JobSearchFilter]
+    filterset_class = JobFilter
+
+    def get_queryset(self):
+        return Job.objects.filter(is_active=True).order_by('-created_at', '-uuid')
+
+    def get(self, request):
+        # Filter errors are raised here, before the response starts streaming
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(iter_job_ndjson(queryset), content_type='application/x-ndjson')
+        filename = f"jobs-{timezone.now():%Y%m%d}.ndjson"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+
+class JobFacets(generics.GenericAPIView):
+
+    """
+    API view for the job filter facet counts.
+
+    Accepts the same filter and search params as AllJob and returns, for
+    each of job_type, education, experience and it_industry, the number of
+    matching jobs per choice, computed in a single grouped query.
+    Cached under the same versioned keys as the listing.
+    """
+
+    filter_backends = [DjangoFilterBackend, JobSearchFilter]
     filterset_class = JobFilter
-    search_fields = ['title','location', 'job_type', 'education', 'it_industry', 'company__company_name']  # Adjusted search_fields
+    facet_fields = ['job_type', 'education', 'experience', 'it_industry']
 
     def get_queryset(self):
-        queryset = cache.get('all_jobs_queryset')
-        if not queryset:
-            queryset = Job.objects.all()
-            cache.set('all_jobs_queryset', queryset, timeout=settings.CACHE_TTL)
-        return queryset
+        return Job.objects.filter(is_active=True)
+
+    def get(self, request):
+        param_names = [*self.filterset_class.base_filters, api_settings.SEARCH_PARAM]
+        cache_key = build_jobs_cache_key('facets', request, param_names)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_facet_counts(self.filter_queryset(self.get_queryset()))
+            cache.set(cache_key, data, timeout=settings.CACHE_TTL)
+        return Response(data)
+
+    def get_facet_counts(self, queryset):
+        # Start every choice at zero so the frontend can render all checkboxes
+        facets = {
+            field: {value: 0 for value, label in Job._meta.get_field(field).choices}
+            for field in self.facet_fields
+        }
+        total = 0
+
+        # One GROUP BY over the facet combinations, rolled up per field here
+        rows = queryset.order_by().values(*self.facet_fields).annotate(count=Count('pk'))
+        for row in rows:
+            total += row['count']
+            for field in self.facet_fields:
+                counts = facets[field]
+                counts[row[field]] = counts.get(row[field], 0) + row['count']
+
+        return {'total': total, 'facets': facets}
+
+
+
+class SalaryInsights(APIView):
+
+    """
+    API view for salary statistics of the active jobs.
+
+    Returns min/avg/max and the 25/50/75/90th percentiles of the salary,
+    overall and grouped by it_industry, experience and job_type. Answered
+    from an in-memory snapshot kept up to date by the job signals.
+    """
+
+    def get(self, request):
+        return Response(get_salary_snapshot().get_stats())
+
+
+
+class RecommendedJobs(APIView):
+
+    """
+    API view for job recommendations of the authenticated candidate.
+
+    Jobs are ranked by TF-IDF similarity between the candidate's skills,
+    experience and education and the job text, leaving out jobs already
+    applied to and jobs asking for more education or experience than the
+    candidate has. `limit` caps the number of results.
+    """
+
+    permission_classes = [IsAuthenticated, IsCandidateUser]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        candidate = getattr(request.user, 'candidate_profile', None)
+        if candidate is None:
+            return Response({"error": "User does not have a candidate profile."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get('limit', settings.RECOMMENDATIONS_MAX_RESULTS))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        limit = max(1, min(limit, settings.RECOMMENDATIONS_MAX_RESULTS))
+
+        applied = Application.objects.filter(candidate=candidate).values_list('job_id', flat=True)
+        hits = get_job_matrix().recommend(
+            candidate_terms(candidate),
+            education_level=candidate_education_level(candidate.education),
+            experience_level=candidate_experience_level(candidate.experience),
+            exclude=set(applied),
+            limit=limit,
+        )
+
+        # Rows can lag behind the database briefly, so re-check is_active
+        jobs = Job.objects.filter(uuid__in=[job_uuid for job_uuid, score in hits], is_active=True).defer('search_vector').in_bulk()
+        recommended = []
+        for job_uuid, score in hits:
+            job = jobs.get(job_uuid)
+            if job is not None:
+                job.score = round(score, 4)
+                recommended.append(job)
+        return Response(RecommendedJobSerializer(recommended, many=True).data)
+
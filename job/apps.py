@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job'
+
+    def ready(self):
+        # Connect the signal receivers
+        from .api import signals
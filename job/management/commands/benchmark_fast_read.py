@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from account.api.serializers import (
+    UserRegistrationSerializer, CandidateProfileSerializer, USER_PROJECTION, CANDIDATE_PROFILE_PROJECTION,
+)
+from account.models import User, CandidateProfile
+from application.models import Application
+from application.serializers import ApplicationSerializer, APPLICATION_PROJECTION
+from job.api.serializers import JobSerializer, JOB_PROJECTION
+from job.models import Job
+from utils.renderers import ORJSONRenderer
+
+# Endpoint name -> (queryset, serializer, projection), matching the views
+BENCHMARKS = {
+    'jobs': (lambda: Job.objects.filter(is_active=True).order_by('-created_at', '-uuid'),
+             JobSerializer, JOB_PROJECTION),
+    'applications': (lambda: Application.objects.order_by('pk'), ApplicationSerializer, APPLICATION_PROJECTION),
+    'users': (lambda: User.objects.order_by('-created_at'), UserRegistrationSerializer, USER_PROJECTION),
+    'candidates': (lambda: CandidateProfile.objects.order_by('pk'),
+                   CandidateProfileSerializer, CANDIDATE_PROFILE_PROJECTION),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares rows/sec of the serializer and fast read paths of the list endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('endpoints', nargs='*', default=list(BENCHMARKS),
+                            help=f"Endpoints to benchmark, among {', '.join(BENCHMARKS)}.")
+        parser.add_argument('--limit', type=int, default=1000,
+                            help='Number of rows rendered per run.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per path; the fastest one is reported.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['endpoints']) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+        for name in options['endpoints']:
+            get_queryset, serializer_class, projection = BENCHMARKS[name]
+            rows = get_queryset()[:options['limit']].count()
+            if not rows:
+                self.stdout.write(f"{name}: no rows, skipped.")
+                continue
+
+            def serializer_path():
+                queryset = get_queryset()[:options['limit']]
+                return JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+            def fast_path():
+                queryset = get_queryset()[:options['limit']]
+                return ORJSONRenderer().render(projection.apply(queryset))
+
+            serializer_seconds, serializer_body = self.measure(serializer_path, options['repeat'])
+            fast_seconds, fast_body = self.measure(fast_path, options['repeat'])
+
+            # User tokens embed the current second, so 'users' can differ
+            # when the two paths run across a second boundary
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: {rows} rows, serializer {rows / serializer_seconds:.0f} rows/s, "
+                f"fast read {rows / fast_seconds:.0f} rows/s "
+                f"({serializer_seconds / fast_seconds:.1f}x), "
+                f"identical output: {'yes' if serializer_body == fast_body else 'no'}"))
+
+    def measure(self, run, repeat):
+        best, body = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
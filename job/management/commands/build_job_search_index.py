@@ -0,0 +1,23 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from job.api.search_index import build_snapshot
+
+class Command(BaseCommand):
+    help = 'Rebuilds the memory-mapped snapshot of the in-process job search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=None,
+                            help='Snapshot file to write (defaults to JOB_SEARCH_INDEX_PATH).')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.JOB_SEARCH_INDEX_PATH
+
+        started = time.monotonic()
+        doc_count = build_snapshot(path)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {doc_count} job(s) into {path} in {elapsed:.1f}s."))
@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from job.api.static_feed import build_static_feed
+
+class Command(BaseCommand):
+    help = 'Pre-renders the first job listing pages and the public company list as static JSON files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', default=None,
+                            help='Directory to publish into (defaults to STATIC_FEED_ROOT).')
+        parser.add_argument('--pages', type=int, default=None,
+                            help='Number of job listing pages (defaults to STATIC_FEED_PAGES).')
+
+    def handle(self, *args, **options):
+        root = options['root'] or settings.STATIC_FEED_ROOT
+
+        started = time.monotonic()
+        page_count = build_static_feed(root=root, pages=options['pages'])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {page_count} job page(s) and the company list to {root}/current in {elapsed:.2f}s."))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from job.api.expiry import expire_jobs
+
+class Command(BaseCommand):
+    help = 'Deactivates jobs whose last date has passed and archives their applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of jobs deactivated per UPDATE statement.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, sweeping every --interval seconds.')
+        parser.add_argument('--interval', type=int, default=60,
+                            help='Seconds between sweeps when running with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            self.sweep(options['batch_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+            close_old_connections()
+
+    def sweep(self, batch_size):
+        started = time.monotonic()
+        expired_count = 0
+        batch_count = 0
+        for batch in expire_jobs(batch_size=batch_size):
+            expired_count += batch
+            batch_count += 1
+
+        elapsed = time.monotonic() - started
+        rate = expired_count / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {expired_count} job(s) in {batch_count} batch(es), "
+            f"{elapsed:.2f}s ({rate:.0f} jobs/s)."))
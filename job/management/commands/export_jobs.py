@@ -0,0 +1,47 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from job.api.export import EXPORT_CHUNK_SIZE, iter_job_ndjson
+from job.api.filters import JobFilter
+from job.models import Job
+
+class Command(BaseCommand):
+    help = 'Exports the active jobs as NDJSON, optionally filtered with the JobFilter params.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-',
+                            help="File to write, '-' for stdout (default).")
+        parser.add_argument('--filter', action='append', default=[], metavar='PARAM=VALUE',
+                            help='JobFilter param, e.g. --filter job_type="Full Time". Repeatable.')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help='Rows fetched from the server-side cursor at a time.')
+
+    def handle(self, *args, **options):
+        params = QueryDict(mutable=True)
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f"Invalid --filter {item!r}, expected PARAM=VALUE.")
+            params.appendlist(name, value)
+
+        filterset = JobFilter(params, queryset=Job.objects.filter(is_active=True).order_by('-created_at', '-uuid'))
+        if not filterset.is_valid():
+            raise CommandError(f"Invalid filters: {dict(filterset.errors)}")
+
+        started = time.monotonic()
+        job_count = 0
+        output = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for block in iter_job_ndjson(filterset.qs, chunk_size=options['chunk_size']):
+                output.write(block)
+                job_count += block.count(b'\n')
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {job_count} job(s) in {elapsed:.1f}s."))
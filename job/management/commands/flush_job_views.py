@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from job.api.view_counts import flush_redis_views
+
+class Command(BaseCommand):
+    help = 'Writes the job view counts buffered in Redis to the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, flushing every --interval seconds.')
+        parser.add_argument('--interval', type=int, default=settings.JOB_VIEWS_FLUSH_INTERVAL,
+                            help='Seconds between flushes when running with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            job_count = flush_redis_views()
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"Flushed view counts of {job_count} job(s) in {elapsed:.2f}s."))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+            close_old_connections()
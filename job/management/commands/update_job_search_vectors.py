@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from job.models import Job
+from job.api.cache import bump_jobs_version
+from job.api.search import update_search_vector
+
+class Command(BaseCommand):
+    help = 'Backfills the full-text search vector of existing jobs in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of jobs updated per UPDATE statement.')
+        parser.add_argument('--only-missing', action='store_true',
+                            help='Only update jobs that have no search vector yet.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        queryset = Job.objects.order_by('pk')
+        if options['only_missing']:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        # Walk the table by primary key so each batch is an index range scan
+        updated_count = 0
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            updated_count += update_search_vector(Job.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+
+        bump_jobs_version()
+        self.stdout.write(self.style.SUCCESS(f"Updated search vector of {updated_count} job(s)."))
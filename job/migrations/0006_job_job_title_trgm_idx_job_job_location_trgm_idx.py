@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:58
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('job', '0005_job_search_vector_job_job_search_vector_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='job_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='job_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
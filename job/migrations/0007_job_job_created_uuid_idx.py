@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('job', '0006_job_job_title_trgm_idx_job_job_location_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-uuid'], name='job_created_uuid_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('job', '0007_job_job_created_uuid_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_active', 'last_date'], name='job_active_last_date_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:10
+
+from django.db import migrations, models
+
+
+def rename_duplicate_titles(apps, schema_editor):
+    # Keep the earliest job of each (company, title) pair, and number the
+    # titles of the later ones: "Title (2)", "Title (3)", ...
+    Job = apps.get_model('job', 'Job')
+    max_length = Job._meta.get_field('title').max_length
+    duplicates = (
+        Job.objects.exclude(title=None).values('company', 'title')
+        .annotate(count=models.Count('uuid')).filter(count__gt=1)
+    )
+    for pair in duplicates:
+        used = set(Job.objects.filter(company=pair['company']).exclude(title=None).values_list('title', flat=True))
+        jobs = Job.objects.filter(company=pair['company'], title=pair['title']).order_by('created_at', 'uuid')
+        number = 1
+        for job in list(jobs)[1:]:
+            title = job.title
+            while title in used:
+                number += 1
+                suffix = f' ({number})'
+                title = pair['title'][:max_length - len(suffix)] + suffix
+            used.add(title)
+            Job.objects.filter(pk=job.pk).update(title=title)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('job', '0008_job_job_active_last_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_titles, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(fields=('company', 'title'), name='job_company_title_uniq'),
+        ),
+    ]
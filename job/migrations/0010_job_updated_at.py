@@ -0,0 +1,27 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_job_created_at(apps, schema_editor):
+    # Jobs written before this field existed count as unchanged since creation
+    Job = apps.get_model('job', 'Job')
+    Job.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0009_job_job_company_title_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_job_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0010_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='views',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
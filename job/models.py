@@ -1,8 +1,11 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from datetime import datetime, timedelta
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
+from django.utils import timezone
 import uuid
 
 from account.models import CompanyProfile
@@ -26,7 +29,7 @@ class Experience(models.TextChoices):
     THREE_YEARS_PLUS = '3 Years above'
     
 def return_date_time():
-    now = datetime.now()
+    now = timezone.now()
     return now + timedelta(days=10)
 
 class ITIndustry(models.TextChoices):
@@ -104,7 +107,14 @@ class Job(models.Model):
     positions = models.IntegerField(default=1)
     last_date = models.DateTimeField(default=return_date_time)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every write, including the queryset updates of the expiry
+    # sweeper; backs the ETag / Last-Modified of the job detail
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Flushed in batches from the buffered counters of job.api.view_counts
+    views = models.PositiveIntegerField(default=0, editable=False)
+    # Weighted full-text document, maintained by job.api.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     # # New fields for storing slugified version of job title
     # title_slug = models.SlugField(unique=True, max_length=255,default='')
@@ -114,6 +124,23 @@ class Job(models.Model):
     #     self.title_slug = slugify(self.title)
     #     super().save(*args,**kwargs) 
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+            # Backs the (created_at, uuid) keyset pagination
+            models.Index(fields=['-created_at', '-uuid'], name='job_created_uuid_idx'),
+            # Lets the expiry sweeper find live jobs past their last date
+            models.Index(fields=['is_active', 'last_date'], condition=models.Q(is_active=True),
+                         name='job_active_last_date_idx'),
+            # Trigram indexes for the substring/fuzzy filters in JobFilter
+            GinIndex(fields=['title'], name='job_title_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='job_location_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+        constraints = [
+            # A company posts each title once; also the conflict target of bulk upserts
+            models.UniqueConstraint(fields=['company', 'title'], name='job_company_title_uniq'),
+        ]
+
     def __str__(self):
         return self.title
     
@@ -1,3 +1,180 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from account.models import User, CompanyProfile, CandidateProfile
+from application.models import Application
+from .api.expiry import expire_jobs
+from .models import Job
+
+
+class BulkCreateJobsTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('company@example.com', 'secret123', role=User.COMPANY, is_active=True)
+        self.company = CompanyProfile.objects.create(
+            user=self.user, company_name='Acme', industry='IT', location='Pune')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('job:job-bulk-create')
+
+    def post(self, jobs, **payload):
+        return self.client.post(self.url, {'jobs': jobs, **payload}, format='json')
+
+    def test_creates_jobs(self):
+        response = self.post([{'title': 'Backend', 'salary': 10}, {'title': 'Frontend', 'salary': 20}])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'created'])
+        self.assertEqual(
+            dict(Job.objects.filter(company=self.company).values_list('title', 'salary')),
+            {'Backend': 10, 'Frontend': 20},
+        )
+
+    def test_existing_title_is_a_conflict(self):
+        job = Job.objects.create(company=self.company, title='Backend', salary=10)
+
+        response = self.post([{'title': 'Backend', 'salary': 99}, {'title': 'Frontend', 'salary': 20}])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        conflict, created = response.data['results']
+        self.assertEqual(conflict['status'], 'conflict')
+        self.assertEqual(conflict['uuid'], job.uuid)
+        self.assertEqual(created['status'], 'created')
+        job.refresh_from_db()
+        self.assertEqual(job.salary, 10)
+
+    def test_only_conflicts_is_409(self):
+        Job.objects.create(company=self.company, title='Backend', salary=10)
+
+        response = self.post([{'title': 'Backend', 'salary': 99}])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['results'][0]['status'], 'conflict')
+
+    def test_upsert_updates_existing_title(self):
+        job = Job.objects.create(company=self.company, title='Backend', salary=10)
+
+        response = self.post([{'title': 'Backend', 'salary': 15}, {'title': 'Frontend', 'salary': 20}], upsert=True)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        updated, created = response.data['results']
+        self.assertEqual((updated['status'], updated['uuid']), ('updated', job.uuid))
+        self.assertEqual(created['status'], 'created')
+        self.assertEqual(Job.objects.filter(company=self.company).count(), 2)
+        job.refresh_from_db()
+        self.assertEqual(job.salary, 15)
+
+    def test_upsert_keeps_omitted_fields(self):
+        last_date = timezone.now() - timedelta(days=3)
+        job = Job.objects.create(
+            company=self.company, title='Backend', salary=10, description='Keep me',
+            last_date=last_date, is_active=False,
+        )
+
+        response = self.post([{'title': 'Backend', 'salary': 15}], upsert=True)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        job.refresh_from_db()
+        self.assertEqual(job.salary, 15)
+        self.assertEqual(job.description, 'Keep me')
+        self.assertEqual(job.last_date, last_date)
+        self.assertFalse(job.is_active)
+
+    def test_duplicate_title_in_payload_is_rejected(self):
+        response = self.post([{'title': 'Backend', 'salary': 10}, {'title': 'Backend', 'salary': 20}])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Job.objects.exists())
+
+
+class JobExpiryTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('company@example.com', 'secret123', role=User.COMPANY, is_active=True)
+        self.company = CompanyProfile.objects.create(
+            user=self.user, company_name='Acme', industry='IT', location='Pune')
+        self.client.force_authenticate(self.user)
+        self.job = Job.objects.create(
+            company=self.company, title='Backend', salary=10, last_date=timezone.now() - timedelta(days=1))
+        candidate_user = User.objects.create_user(
+            'candidate@example.com', 'secret123', role=User.CANDIDATE, is_active=True)
+        candidate = CandidateProfile.objects.create(user=candidate_user, name='Dev', location='Pune')
+        self.application = Application.objects.create(candidate=candidate, job=self.job)
+
+        self.assertEqual(sum(expire_jobs()), 1)
+        self.job.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertFalse(self.job.is_active)
+        self.assertTrue(self.application.is_archived)
+
+    def listed_titles(self):
+        response = self.client.get(reverse('job:all-job'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['title'] for job in response.data['results']]
+
+    def assertRevived(self):
+        self.job.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertTrue(self.job.is_active)
+        self.assertFalse(self.application.is_archived)
+        self.assertEqual(self.listed_titles(), ['Backend'])
+
+    def test_expired_job_is_not_listed(self):
+        self.assertEqual(self.listed_titles(), [])
+
+    def test_expired_job_is_only_retrieved_by_its_company(self):
+        url = reverse('job:job-CRUD', kwargs={'uuid': self.job.uuid})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(self.application.candidate.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_upsert_with_new_last_date_revives_job(self):
+        response = self.client.post(
+            reverse('job:job-bulk-create'),
+            {'jobs': [{'title': 'Backend', 'last_date': timezone.now() + timedelta(days=30)}], 'upsert': True},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['results'][0]['status'], 'updated')
+        self.assertRevived()
+
+    def test_bulk_upsert_without_last_date_keeps_job_expired(self):
+        response = self.client.post(
+            reverse('job:job-bulk-create'), {'jobs': [{'title': 'Backend', 'salary': 20}], 'upsert': True},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.is_active)
+
+    def test_update_with_new_last_date_revives_job(self):
+        response = self.client.put(
+            reverse('job:job-CRUD', kwargs={'uuid': self.job.uuid}),
+            {'title': 'Backend', 'last_date': timezone.now() + timedelta(days=30)},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRevived()
+
+    def test_update_with_past_last_date_expires_job(self):
+        self.job.is_active = True
+        self.job.save(update_fields=['is_active'])
+
+        response = self.client.put(
+            reverse('job:job-CRUD', kwargs={'uuid': self.job.uuid}),
+            {'title': 'Backend', 'last_date': timezone.now() - timedelta(days=2)},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.is_active)
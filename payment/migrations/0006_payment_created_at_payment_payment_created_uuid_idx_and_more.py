@@ -0,0 +1,36 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_payment_datetime(apps, schema_editor):
+    # Best available creation time for payments made before this field existed
+    Payment = apps.get_model('payment', 'Payment')
+    Payment.objects.update(created_at=models.F('dateTime'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0007_companyprofile_company_name_trgm_idx'),
+        ('payment', '0005_alter_payment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_payment_datetime, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-created_at', '-uuid'], name='payment_created_uuid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['-start_date', '-uuid'], name='subscription_start_uuid_idx'),
+        ),
+    ]
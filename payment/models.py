@@ -44,6 +44,12 @@ class Subscription(models.Model):
         Overrides the save method to set the end_date based on the plan's duration if not already set.
     """
     
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the admin subscription list
+            models.Index(fields=['-start_date', '-uuid'], name='subscription_start_uuid_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.end_date:
             duration_days = int(self.plan.duration)
@@ -73,6 +79,13 @@ class Payment(models.Model):
     status = models.CharField(max_length=50, choices=PAYMENT_STATUS_CHOICES, default="pending")
     dateTime = models.DateTimeField(auto_now=True)
     payment_method = models.CharField(max_length=50, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the admin payment list
+            models.Index(fields=['-created_at', '-uuid'], name='payment_created_uuid_idx'),
+        ]
 
     def __str__(self):
         return str(self.payment_id)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SubscriptionPlan
+from utils.cache_versions import bump_version
+
+# Version counter of the subscription plan list, see utils.conditional
+PLANS_VERSION = 'subscription_plans'
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def bump_plans_version(sender, instance, **kwargs):
+    bump_version(PLANS_VERSION)
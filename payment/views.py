@@ -14,14 +14,19 @@ from .models import Subscription, SubscriptionPlan, Payment
 from .serializer import SubscriptionPlanSerializer, PaymentSerializer, SubscriptionSerializer
 from .client import RazorpayClient
 from account.api.permissions import IsCompanyUser, IsAdminUser
-from job.api.pagination import CustomPagination
+from job.api.pagination import CustomPagination, CursorPaginationMixin
+from django.utils.decorators import method_decorator
+from utils.conditional import version_condition
+from .signals import PLANS_VERSION
 
 
 
 
+@method_decorator(version_condition(PLANS_VERSION), name='get')
 class SubscriptionPlanListView(generics.ListAPIView):
     """"
     API view to list all subscription plans.
+    Conditional GETs are answered with 304 until a plan changes.
     """
     queryset = SubscriptionPlan.objects.all()
     serializer_class = SubscriptionPlanSerializer
@@ -179,21 +184,24 @@ class AdminSubscriptionPlanDetailView(generics.RetrieveUpdateDestroyAPIView):
     authentication_classes = [JWTAuthentication]
     lookup_field = 'uuid'
 
-class AdminSubscriptionListView(generics.ListAPIView):
+class AdminSubscriptionListView(CursorPaginationMixin, generics.ListAPIView):
     """
     API view to list all subscriptions for admin.
+    Pass `pagination=cursor` for keyset pagination.
     """
-    queryset = Subscription.objects.all()
+    queryset = Subscription.objects.order_by('-start_date', '-uuid')
     serializer_class = SubscriptionSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     authentication_classes = [JWTAuthentication]
     pagination_class = CustomPagination
+    cursor_ordering = ('-start_date', '-uuid')
 
-class AdminPaymentListView(generics.ListAPIView):
+class AdminPaymentListView(CursorPaginationMixin, generics.ListAPIView):
     """
     API view to list all payments for admin.
+    Pass `pagination=cursor` for keyset pagination.
     """
-    queryset = Payment.objects.all()
+    queryset = Payment.objects.order_by('-created_at', '-uuid')
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     authentication_classes = [JWTAuthentication]
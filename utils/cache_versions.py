@@ -0,0 +1,64 @@
+"""
+Per-table version counters kept in the cache.
+
+Cached responses embed the current version of the table they were built
+from in their key, so bumping the version makes every older entry
+unreachable without having to find and delete them one by one. The time
+of the last bump is kept next to each counter for Last-Modified headers.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'version'
+
+
+def _version_key(name):
+    return f"{VERSION_KEY_PREFIX}:{name}"
+
+
+def _modified_key(name):
+    return f"{VERSION_KEY_PREFIX}:{name}:modified"
+
+
+def get_version(name):
+    """
+    Return the current version counter for `name`, creating it if needed.
+    """
+
+    version = cache.get(_version_key(name))
+    if version is None:
+        cache.add(_version_key(name), 1, timeout=None)
+        version = cache.get(_version_key(name), 1)
+    return version
+
+
+def bump_version(name):
+    """
+    Increment the version counter for `name` and return the new value.
+    """
+
+    key = _version_key(name)
+    cache.set(_modified_key(name), time.time(), timeout=None)
+    # add() is a no-op when the key already exists, so incr() never misses
+    cache.add(key, 1, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key was evicted between add() and incr()
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def get_last_modified(name):
+    """
+    Return when `name` was last bumped as an aware datetime, or None if
+    that is not known (never bumped, or evicted).
+    """
+
+    timestamp = cache.get(_modified_key(name))
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
@@ -0,0 +1,43 @@
+"""
+Conditional GET support backed by the per-table version counters.
+
+Validators are computed from a counter read instead of the rendered body,
+so a matching If-None-Match / If-Modified-Since is answered with a 304
+before any query or serializer work is done.
+"""
+
+import hashlib
+
+from django.views.decorators.http import condition
+
+from .cache_versions import get_version, get_last_modified
+
+
+def version_etag(name, request):
+    """
+    Strong ETag for `request` against the current version of `name`.
+
+    The URL and Accept header are part of it, since the same version
+    renders differently per page, filter and media type.
+    """
+
+    parts = [
+        name,
+        str(get_version(name)),
+        request.get_host(),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+    ]
+    return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def version_condition(name):
+    """
+    condition() decorator for a GET handler whose response only changes
+    when the version counter `name` is bumped.
+    """
+
+    return condition(
+        etag_func=lambda request, *args, **kwargs: version_etag(name, request),
+        last_modified_func=lambda request, *args, **kwargs: get_last_modified(name),
+    )
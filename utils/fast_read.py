@@ -0,0 +1,129 @@
+"""
+Serializer-free read path for list endpoints.
+
+A Projection describes a serializer's output as (name, source, convert)
+entries. Rows are fetched with `.values_list()` and turned into dicts by
+a function compiled once per projection, so a list costs one query and
+one dict per row instead of a serializer field walk per row. Converters
+reproduce the matching DRF field's `to_representation()`, keeping the
+rendered output byte-for-byte identical.
+"""
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .renderers import ORJSONRenderer
+
+
+def to_datetime(value):
+    # serializers.DateTimeField with the default ISO 8601 format
+    if not value:
+        return None
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def to_date(value):
+    # serializers.DateField with the default ISO 8601 format
+    if not value:
+        return None
+    return value.isoformat()
+
+
+def to_file_url(name):
+    # serializers.FileField without a request in the serializer context
+    if not name:
+        return None
+    return default_storage.url(name)
+
+
+class Projection:
+
+    """
+    Precompiled mapping from `.values_list()` rows to response dicts.
+
+    `fields` is a list of (name, source) or (name, source, convert)
+    entries, in the serializer's field order. `source` is an ORM lookup,
+    or a tuple of them whose values are all passed to `convert`. `extra`
+    sources are fetched without being output, e.g. the ordering fields
+    cursor pagination reads from the last row.
+    """
+
+    def __init__(self, fields, extra=()):
+        self.fields = [tuple(field) + (None,) * (3 - len(field)) for field in fields]
+        self.sources = []
+        for name, source, convert in self.fields:
+            for lookup in (source if isinstance(source, tuple) else (source,)):
+                if lookup not in self.sources:
+                    self.sources.append(lookup)
+        self.sources.extend(lookup for lookup in extra if lookup not in self.sources)
+        self.project = self._compile()
+
+    def _compile(self):
+        namespace = {}
+        items = []
+        for position, (name, source, convert) in enumerate(self.fields):
+            lookups = source if isinstance(source, tuple) else (source,)
+            args = ', '.join(f"row[{self.sources.index(lookup)}]" for lookup in lookups)
+            if convert is None:
+                items.append(f"{name!r}: {args}")
+            else:
+                namespace[f'convert_{position}'] = convert
+                items.append(f"{name!r}: convert_{position}({args})")
+        source = f"def project(row):\n    return {{{', '.join(items)}}}\n"
+        exec(compile(source, f'<projection {self.sources}>', 'exec'), namespace)
+        return namespace['project']
+
+    def values(self, queryset):
+        # Named rows, so keyset pagination can read the ordering fields by name
+        return queryset.values_list(*self.sources, named=True)
+
+    def rows(self, rows):
+        project = self.project
+        return [project(row) for row in rows]
+
+    def apply(self, queryset):
+        return self.rows(self.values(queryset))
+
+
+class FastReadMixin:
+
+    """
+    Serve list GETs through `projection` and orjson rendering instead of
+    a ModelSerializer per row. Set `fast_read = False` on a view to go back
+    to the serializer path.
+
+    Generic list views get it through `list()`; plain APIViews call
+    `fast_read_response()` with their queryset.
+    """
+
+    fast_read = True
+    projection = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.fast_read:
+            renderers = [ORJSONRenderer() if type(renderer) is JSONRenderer else renderer for renderer in renderers]
+        return renderers
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_read:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.projection.rows(page))
+        return Response(self.projection.rows(queryset))
+
+    def fast_read_response(self, queryset, serializer_class, **kwargs):
+        if not self.fast_read:
+            return Response(serializer_class(queryset, many=True).data, **kwargs)
+        return Response(self.projection.apply(queryset), **kwargs)
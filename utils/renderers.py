@@ -0,0 +1,39 @@
+"""
+orjson based JSON rendering.
+
+Produces the same bytes as DRF's JSONRenderer with the default compact,
+unicode output, several times faster on large lists. Indented output
+(e.g. for the browsable API) is left to JSONRenderer.
+"""
+
+import orjson
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    """
+    Drop-in replacement for JSONRenderer.
+
+    Types orjson does not handle natively (Decimal, lazy strings, ...) go
+    through DRF's JSONEncoder, so they render exactly as before.
+    """
+
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self._encoder.default, option=_OPTIONS)
+        # Same escaping of U+2028/U+2029 as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret